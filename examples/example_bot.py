@@ -36,13 +36,8 @@ tp = 100
 m_trade = CTrade(simulator=tester, magic_number=magic_number, filling_type_symbol=symbol, deviation_points=slippage)
 symbol_info = tester.symbol_info(symbol=symbol)
 
-def pos_exists(magic: int, type: int) -> bool:
-
-    for position in tester.positions_get():
-        if position.type == type and position.magic == magic:
-            return True
-    
-    return False
+sl_distance = sl * symbol_info.point # in price units, computed once instead of on every tick
+tp_distance = tp * symbol_info.point
 
 def on_tick():
     
@@ -51,13 +46,11 @@ def on_tick():
     ask = tick_info.ask
     bid = tick_info.bid
     
-    pts = symbol_info.point
-    
-    if not pos_exists(magic=magic_number, type=mt5.POSITION_TYPE_BUY): # If a position of such kind doesn't exist
-        m_trade.buy(volume=0.1, symbol=symbol, price=ask, sl=ask-sl*pts, tp=ask+tp*pts, comment="Tester buy") # we open a buy position
+    if not tester.position_exists(symbol=symbol, magic=magic_number, type=mt5.POSITION_TYPE_BUY): # If a position of such kind doesn't exist
+        m_trade.buy(volume=0.1, symbol=symbol, price=ask, sl=ask-sl_distance, tp=ask+tp_distance, comment="Tester buy") # we open a buy position
     
-    if not pos_exists(magic=magic_number, type=mt5.POSITION_TYPE_SELL): # If a position of such kind doesn't exist
-        m_trade.sell(volume=0.1, symbol=symbol, price=bid, sl=bid+sl*pts, tp=bid-tp*pts, comment="Tester sell") # we open a sell position
+    if not tester.position_exists(symbol=symbol, magic=magic_number, type=mt5.POSITION_TYPE_SELL): # If a position of such kind doesn't exist
+        m_trade.sell(volume=0.1, symbol=symbol, price=bid, sl=bid+sl_distance, tp=bid-tp_distance, comment="Tester sell") # we open a sell position
     
 
 tester.OnTick(ontick_func=on_tick) # very important!
\ No newline at end of file
@@ -2,11 +2,13 @@ __version__ = '1.0.0'
 __author__  = 'Omega Joctan Msigwa.'
 
 from collections import namedtuple
+from dataclasses import dataclass
 import logging
 from logging.handlers import RotatingFileHandler
 from datetime import datetime, timezone
 from calendar import monthrange
 import MetaTrader5
+import numpy as np
 
 IS_DEBUG = True
 
@@ -24,6 +26,34 @@ Tick = namedtuple(
     ]
 )
 
+# numpy layouts of the arrays returned by MetaTrader5's copy_rates_* and copy_ticks_* functions
+
+RATES_DTYPE = np.dtype(
+    [
+        ("time", "<i8"),
+        ("open", "<f8"),
+        ("high", "<f8"),
+        ("low", "<f8"),
+        ("close", "<f8"),
+        ("tick_volume", "<u8"),
+        ("spread", "<i4"),
+        ("real_volume", "<u8"),
+    ]
+)
+
+TICKS_DTYPE = np.dtype(
+    [
+        ("time", "<i8"),
+        ("bid", "<f8"),
+        ("ask", "<f8"),
+        ("last", "<f8"),
+        ("volume", "<u8"),
+        ("time_msc", "<i8"),
+        ("flags", "<u4"),
+        ("volume_real", "<f8"),
+    ]
+)
+
 def ensure_symbol(mt5_instance: MetaTrader5, symbol: str) -> bool:
     info = mt5_instance.symbol_info(symbol)
     if info is None:
@@ -43,6 +73,17 @@ def bytestoMB(size_in_bytes):
 def PeriodSeconds(period: int) -> int:
     """
     Convert MT5 timeframe to seconds.
+    The standard timeframes are looked up, anything else is decoded from its bit flags.
+    """
+    
+    seconds = _PERIOD_SECONDS.get(period)
+    if seconds is not None:
+        return seconds
+    
+    return _decode_period_seconds(period)
+
+def _decode_period_seconds(period: int) -> int:
+    """
     Correctly decodes MetaTrader 5 bit flags.
     """
 
@@ -70,6 +111,9 @@ def ensure_utc(dt: datetime) -> datetime:
     - Naive datetimes are assumed to be UTC
     - Aware datetimes are converted to UTC
     """
+    if dt.tzinfo is timezone.utc: # already UTC, nothing to convert
+        return dt
+    
     if dt.tzinfo is None:
         # Naive → assume UTC
         return dt.replace(tzinfo=timezone.utc)
@@ -102,12 +146,9 @@ def make_tick(
     # MT5 semantics
     time  = ensure_utc(time)
 
-    if time_msc == 0:
-        if isinstance(time, datetime):
-            time_msc = time.timestamp()
-                
-    time_sec = int(time.timestamp())
-    time_msc = int(time.timestamp() * 1000)
+    timestamp = time.timestamp() # converted once, both fields derive from it
+    time_sec = int(timestamp)
+    time_msc = int(timestamp * 1000)
 
     return Tick(
         time=time_sec,
@@ -190,7 +231,7 @@ def make_tick_from_tuple(data: tuple) -> Tick:
         volume_real=volume_real,
     )
     
-TradeOrder = namedtuple(
+class TradeOrder(namedtuple(
     "TradeOrder",
     [
         "ticket",
@@ -218,10 +259,11 @@ TradeOrder = namedtuple(
         "comment",
         "external_id",
     ]
-)
+)):
+    __slots__ = () # no per-instance dict, records stay immutable tuples like the ones MetaTrader5 returns
 
 
-TradePosition = namedtuple(
+class TradePosition(namedtuple(
     "TradePosition",
     [
         "ticket",
@@ -244,10 +286,11 @@ TradePosition = namedtuple(
         "comment",
         "external_id",
     ]
-)
+)):
+    __slots__ = ()
 
 
-TradeDeal = namedtuple(
+class TradeDeal(namedtuple(
     "TradeDeal",
     [
         "ticket",        # DEAL_TICKET
@@ -270,7 +313,8 @@ TradeDeal = namedtuple(
         "external_id",   # DEAL_EXTERNAL_ID
         "balance",       # Account balance
     ]
-)
+)):
+    __slots__ = ()
 
 
 AccountInfo = namedtuple(
@@ -307,6 +351,37 @@ AccountInfo = namedtuple(
     ]
 )
 
+@dataclass
+class AccountState: # the tester's own account, updated in place on every tick; AccountInfo snapshots of it are handed out
+    login: int
+    trade_mode: int
+    leverage: int
+    limit_orders: int
+    margin_so_mode: int
+    trade_allowed: bool
+    trade_expert: bool
+    margin_mode: int
+    currency_digits: int
+    fifo_close: bool
+    balance: float
+    credit: float
+    profit: float
+    equity: float
+    margin: float
+    margin_free: float
+    margin_level: float
+    margin_so_call: float
+    margin_so_so: float
+    margin_initial: float
+    margin_maintenance: float
+    assets: float
+    liabilities: float
+    commission_blocked: float
+    name: str
+    server: str
+    currency: str
+    company: str
+
 SUPPORTED_TESTER_MODELLING = {
                 "every_tick",
                 "real_ticks",
@@ -376,20 +451,34 @@ ORDER_STATE_MAP = {
     MetaTrader5.ORDER_STATE_REQUEST_CANCEL: "Order is being deleted (deleting from the trading system)"
 }
 
-        
-BUY_ACTIONS = {
+
+ORDER_TYPES = frozenset({
     MetaTrader5.ORDER_TYPE_BUY,
+    MetaTrader5.ORDER_TYPE_SELL,
     MetaTrader5.ORDER_TYPE_BUY_LIMIT,
+    MetaTrader5.ORDER_TYPE_SELL_LIMIT,
     MetaTrader5.ORDER_TYPE_BUY_STOP,
+    MetaTrader5.ORDER_TYPE_SELL_STOP,
     MetaTrader5.ORDER_TYPE_BUY_STOP_LIMIT,
-}
+    MetaTrader5.ORDER_TYPE_SELL_STOP_LIMIT,
+    MetaTrader5.ORDER_TYPE_CLOSE_BY,
+})
 
-SELL_ACTIONS = {
+BUY_ACTIONS = frozenset({
+    MetaTrader5.ORDER_TYPE_BUY,
+    MetaTrader5.ORDER_TYPE_BUY_LIMIT,
+    MetaTrader5.ORDER_TYPE_BUY_STOP,
+    MetaTrader5.ORDER_TYPE_BUY_STOP_LIMIT,
+})
+
+SELL_ACTIONS = frozenset({
     MetaTrader5.ORDER_TYPE_SELL,
     MetaTrader5.ORDER_TYPE_SELL_LIMIT,
     MetaTrader5.ORDER_TYPE_SELL_STOP,
     MetaTrader5.ORDER_TYPE_SELL_STOP_LIMIT,
-}
+})
+
+ORDER_DIRECTIONS = {order_type: 1 for order_type in BUY_ACTIONS} | {order_type: -1 for order_type in SELL_ACTIONS} # order type -> sign of the price move in its favor
 
 TIMEFRAMES_MAP = {
     "M1": MetaTrader5.TIMEFRAME_M1,
@@ -418,6 +507,8 @@ TIMEFRAMES_MAP = {
 # Reverse map
 TIMEFRAMES_MAP_REVERSE = {v: k for k, v in TIMEFRAMES_MAP.items()}
 
+_PERIOD_SECONDS = {timeframe: _decode_period_seconds(timeframe) for timeframe in TIMEFRAMES_MAP.values()} # timeframe -> seconds, used by PeriodSeconds
+
 def log_date_suffix():
     return datetime.now(timezone.utc).strftime("%Y%m%d")
 
@@ -0,0 +1,107 @@
+import numpy as np
+
+# numeric fields of the open positions, kept as contiguous columns for the per tick monitoring
+
+POSITIONS_BOOK_FIELDS = {
+    "symbol_id": np.int32,
+    "type": np.int32,
+    "volume": np.float64,
+    "price_open": np.float64,
+    "price_current": np.float64,
+    "sl": np.float64,
+    "tp": np.float64,
+    "profit": np.float64,
+    "time_update": np.int64,
+    "time_update_msc": np.int64,
+}
+
+ORDERS_BOOK_FIELDS = {
+    "symbol_id": np.int32,
+    "type": np.int32,
+    "price_open": np.float64,
+    "price_stoplimit": np.float64,
+    "time_expiration": np.int64,
+}
+
+class OpenBook:
+    def __init__(self, fields: dict, capacity: int = 64):
+
+        """A container of the open trades storing records alongside their numeric fields as separate arrays (structure of arrays).
+
+        Unlike the history, records come and go, the rows after a removed one shift down so that the columns stay dense and in insertion order.
+
+        Args:
+            fields (dict): Column name -> dtype, names must match the records' attributes except for symbol_id which is given on add.
+            capacity (int, optional): Number of rows allocated upfront, doubled whenever it's exhausted.
+        """
+
+        self.__arrays = {name: np.zeros(capacity, dtype=dtype) for name, dtype in fields.items()}
+        self.__names = tuple(name for name in fields if name != "symbol_id")
+        self.__size = 0
+
+        self.objects = [] # records, row aligned
+        self.rows: dict[int, int] = {} # ticket -> row
+
+    def add(self, record, symbol_id: int):
+
+        n = self.__size
+        arrays = self.__arrays
+
+        if n == len(arrays["symbol_id"]):
+            for name, array in arrays.items():
+                arrays[name] = np.resize(array, 2 * n)
+
+        arrays["symbol_id"][n] = symbol_id
+        for name in self.__names:
+            arrays[name][n] = getattr(record, name)
+
+        self.__size = n + 1
+        self.objects.append(record)
+        self.rows[record.ticket] = n
+
+    def remove(self, ticket: int):
+
+        row = self.rows.pop(ticket)
+        last = self.__size - 1
+
+        if row != last: # removals are rare next to the per tick scans, keeping the order is worth the shift
+            for array in self.__arrays.values():
+                array[row:last] = array[row + 1:last + 1] # overlapping slices are copied safely by numpy
+
+            for moved in range(row + 1, last + 1):
+                self.rows[self.objects[moved].ticket] = moved - 1
+
+        del self.objects[row]
+        self.__size = last
+
+    def compact(self, keep: np.ndarray):
+
+        """Drops every row whose entry in the boolean mask keep is False, in a single pass over each column"""
+
+        size = self.__size
+        kept = int(np.count_nonzero(keep))
+
+        for array in self.__arrays.values():
+            array[:kept] = array[:size][keep]
+
+        self.objects = [record for record, k in zip(self.objects, keep.tolist()) if k]
+        self.rows = {record.ticket: row for row, record in enumerate(self.objects)}
+        self.__size = kept
+
+    def replace(self, record):
+
+        """Puts an updated copy of a record in its row, the columns are left to set()"""
+
+        self.objects[self.rows[record.ticket]] = record
+
+    def set(self, ticket: int, name: str, value):
+        self.__arrays[name][self.rows[ticket]] = value
+
+    def column(self, name: str) -> np.ndarray:
+
+        """A view of the used rows of a column e.g. book.column("profit")"""
+
+        return self.__arrays[name][:self.__size]
+
+    def __len__(self) -> int:
+        return self.__size
@@ -0,0 +1,207 @@
+from typing import Optional
+import numpy as np
+from strategytester5._kernels import window_range
+
+# numeric columns kept alongside the history records, tickets are looked up through the rows dict (ticket -> row) instead of a column
+
+DEALS_HISTORY_DTYPE = np.dtype(
+    [
+        ("time", "<i8"),
+        ("time_msc", "<i8"),
+        ("type", "<i4"),
+        ("entry", "<i4"),
+        ("magic", "<i8"),
+        ("volume", "<f8"),
+        ("price", "<f8"),
+        ("commission", "<f8"),
+        ("swap", "<f8"),
+        ("profit", "<f8"),
+        ("fee", "<f8"),
+        ("balance", "<f8"),
+    ]
+)
+
+ORDERS_HISTORY_DTYPE = np.dtype(
+    [
+        ("time_setup", "<i8"),
+        ("time_setup_msc", "<i8"),
+        ("magic", "<i8"),
+        ("volume_initial", "<f8"),
+    ]
+) # only fields that never change once an order is placed, a pending order's later modifications replace its active record and not this one
+
+def _bisect_rows(rows: list[int], times: np.ndarray, t: int, right: bool) -> int:
+
+    """bisect.bisect_left (or bisect_right) over rows ordered by their times, bisect's key argument needs python 3.10"""
+
+    lo, hi = 0, len(rows)
+    while lo < hi:
+        mid = (lo + hi) // 2
+        mid_time = times[rows[mid]]
+
+        if mid_time < t or (right and mid_time == t):
+            lo = mid + 1
+        else:
+            hi = mid
+
+    return lo
+
+class HistoryTable:
+    def __init__(self, dtype: np.dtype, time_field: str, capacity: int = 1024):
+
+        """An append-only history container storing records alongside their numeric fields as columns (structure of arrays).
+
+        Args:
+            dtype (np.dtype): Structured layout of the columns, field names must match the records' attributes.
+            time_field (str): The record's attribute (in seconds) that date range queries are made against.
+            capacity (int, optional): Number of rows allocated upfront, doubled whenever it's exhausted.
+        """
+
+        self.__columns = np.empty(capacity, dtype=dtype)
+        self.__names = dtype.names
+        self.__size = 0
+
+        self.__time_field = time_field
+        self.__times = np.empty(capacity, dtype=np.int64) # contiguous copy of the time field, for binary searching
+        self.__rank = None # rows ordered by time, only built once a record arrives out of order (e.g. when symbols' ticks interleave)
+        self.__sorted_times = None # times in the order of __rank
+        self.__symbol_ids = np.empty(capacity, dtype=np.int32) # interned symbols, for vectorized symbol filters
+
+        self.objects = [] # records in insertion order
+        self.rows: dict[int, int] = {} # ticket -> row
+        self.by_position: dict[int, list] = {} # position id -> records
+        self.by_symbol: dict[str, list[int]] = {} # symbol -> rows
+        self.symbol_ids: dict[str, int] = {} # symbol -> interned id
+
+    def append(self, record):
+
+        n = self.__size
+        if n == len(self.__columns):
+            self.__columns = np.resize(self.__columns, 2 * n)
+            self.__times = np.resize(self.__times, 2 * n)
+            self.__symbol_ids = np.resize(self.__symbol_ids, 2 * n)
+            if self.__rank is not None:
+                self.__rank = np.resize(self.__rank, 2 * n)
+                self.__sorted_times = np.resize(self.__sorted_times, 2 * n)
+
+        t = getattr(record, self.__time_field)
+
+        self.__columns[n] = tuple(getattr(record, name) for name in self.__names)
+        self.__times[n] = t
+        self.__symbol_ids[n] = self.symbol_ids.setdefault(record.symbol, len(self.symbol_ids))
+        self.__size = n + 1
+
+        if self.__rank is not None:
+            self.__insert_rank(n, t)
+        elif n > 0 and t < self.__times[n - 1]:
+            self.__build_rank()
+
+        self.objects.append(record)
+        self.rows[record.ticket] = n
+
+        bucket = self.by_position.get(record.position_id)
+        if bucket is None:
+            self.by_position[record.position_id] = [record]
+        else:
+            bucket.append(record)
+
+        rows = self.by_symbol.get(record.symbol)
+        if rows is None:
+            self.by_symbol[record.symbol] = [n]
+        else:
+            rows.append(n)
+
+    def __build_rank(self):
+
+        size = self.__size
+        capacity = len(self.__times)
+
+        self.__rank = np.empty(capacity, dtype=np.int64)
+        self.__rank[:size] = np.argsort(self.__times[:size], kind="stable")
+
+        self.__sorted_times = np.empty(capacity, dtype=np.int64)
+        self.__sorted_times[:size] = self.__times[self.__rank[:size]]
+
+    def __insert_rank(self, row: int, t: int):
+
+        """Inserts the newest row into the time ordered rank, after any rows sharing its time"""
+
+        pos = int(np.searchsorted(self.__sorted_times[:row], t, side="right"))
+
+        self.__rank[pos + 1:row + 1] = self.__rank[pos:row] # overlapping slices are copied safely by numpy
+        self.__sorted_times[pos + 1:row + 1] = self.__sorted_times[pos:row]
+
+        self.__rank[pos] = row
+        self.__sorted_times[pos] = t
+
+    @property
+    def columns(self) -> np.ndarray:
+
+        """A view of the used rows, each field can be accessed as a column e.g. table.columns["profit"]"""
+
+        return self.__columns[:self.__size]
+
+    def between(self, time_from: int, time_to: int, symbols: Optional[list[str]] = None) -> list:
+
+        """Records whose time falls within time_from and time_to (both inclusive), in insertion order.
+
+        Args:
+            time_from (int): Start of the range in seconds.
+            time_to (int): End of the range in seconds.
+            symbols (list[str], optional): When given, only the records of these symbols are visited.
+        """
+
+        size = self.__size
+        times = self.__times[:size]
+
+        if self.__rank is not None: # records arrived out of order, the time ordered rank narrows the rows down
+            start, end = window_range(self.__sorted_times[:size], time_from, time_to)
+            rows = self.__rank[start:end]
+
+            if symbols is not None:
+                ids = [self.symbol_ids[symbol] for symbol in symbols if symbol in self.symbol_ids]
+                rows = rows[np.isin(self.__symbol_ids[rows], ids)]
+
+            return [self.objects[row] for row in np.sort(rows).tolist()] # back to insertion order
+
+        if symbols is None:
+            start, end = window_range(times, time_from, time_to)
+            return self.objects[start:end]
+
+        selected = []
+        for symbol in symbols: # a symbol's rows are a subsequence of the sorted times, binary search them too
+            rows = self.by_symbol.get(symbol)
+            if not rows:
+                continue
+
+            lo = _bisect_rows(rows, times, time_from, right=False)
+            hi = _bisect_rows(rows, times, time_to, right=True)
+            selected.extend(rows[lo:hi])
+
+        if len(symbols) > 1:
+            selected.sort() # back to insertion order
+
+        return [self.objects[row] for row in selected]
+
+    def count_between(self, time_from: int, time_to: int) -> int:
+
+        """Number of records whose time falls within time_from and time_to (both inclusive)"""
+
+        times = self.__times[:self.__size] if self.__rank is None else self.__sorted_times[:self.__size]
+
+        start, end = window_range(times, time_from, time_to)
+        return int(end - start)
+
+    def get(self, ticket: int):
+
+        row = self.rows.get(ticket)
+        return None if row is None else self.objects[row]
+
+    def __len__(self) -> int:
+        return self.__size
+
+    def __iter__(self):
+        return iter(self.objects)
+
+    def __getitem__(self, index):
+        return self.objects[index]
@@ -0,0 +1,167 @@
+import numpy as np
+from MetaTrader5 import (
+    ORDER_TYPE_BUY_LIMIT, ORDER_TYPE_SELL_LIMIT,
+    ORDER_TYPE_BUY_STOP, ORDER_TYPE_SELL_STOP,
+    ORDER_TYPE_BUY_STOP_LIMIT, ORDER_TYPE_SELL_STOP_LIMIT,
+)
+
+try:
+    from numba import njit
+    JIT_ENABLED = True
+except ImportError: # numba is optional, without it the kernels below run as regular python functions
+    JIT_ENABLED = False
+
+    def njit(*args, **kwargs):
+        if len(args) == 1 and callable(args[0]):
+            return args[0]
+        return lambda func: func
+
+@njit(cache=True)
+def window_until(times: np.ndarray, t: int, count: int):
+
+    """Rows [start, end) of the last 'count' items whose time is less than or equal to t"""
+
+    end = np.searchsorted(times, t, side="right")
+    start = max(0, end - count)
+
+    return start, end
+
+@njit(cache=True)
+def window_range(times: np.ndarray, t_from: int, t_to: int):
+
+    """Rows [start, end) of the items whose time falls within t_from and t_to (both inclusive)"""
+
+    start = np.searchsorted(times, t_from, side="left")
+    end = np.searchsorted(times, t_to, side="right")
+
+    return start, max(start, end)
+
+PROFIT_BY_CONTRACT = 0 # FOREX / CFD / STOCKS, factor = contract size
+PROFIT_BY_TICKS = 1 # FUTURES, factor = tick value / tick size
+PROFIT_BONDS = 2 # factor = contract size
+
+EXIT_NONE = 0
+EXIT_TP = 1
+EXIT_SL = 2
+
+@njit(cache=True)
+def monitor_positions(is_buy, volumes, opens, currents, profits, sl, tp, bids, asks, kinds, factors, face_values, accrued_interests,
+                      margin_a, margin_b, prices_out, profits_out, exits_out):
+
+    """A single pass over the open positions.
+
+    Returns the totals of their profits and margins as of the previous pass (what the account is valued at), each margin
+    rounded to 2 digits like order_calc_margin, while their current prices, unrounded profits (NaN for the kinds not
+    handled here) and exits are written into the *_out arrays.
+    """
+
+    total_profit = 0.0
+    total_margin = 0.0
+
+    for i in range(is_buy.size):
+        total_profit += profits[i]
+        total_margin += round(margin_a[i] * volumes[i] * currents[i] + margin_b[i] * volumes[i], 2)
+
+        if is_buy[i]:
+            price, direction = bids[i], 1.0
+        else:
+            price, direction = asks[i], -1.0
+
+        kind = kinds[i]
+        price_delta = (price - opens[i]) * direction
+
+        if kind == PROFIT_BY_CONTRACT:
+            profit = price_delta * factors[i] * volumes[i]
+        elif kind == PROFIT_BY_TICKS:
+            profit = price_delta * volumes[i] * factors[i]
+        elif kind == PROFIT_BONDS:
+            profit = volumes[i] * factors[i] * (face_values[i] * (price - opens[i]) + accrued_interests[i])
+        else:
+            profit = np.nan
+
+        exit_ = EXIT_NONE
+        if tp[i] > 0 and ((is_buy[i] and price >= tp[i]) or (not is_buy[i] and price <= tp[i])):
+            exit_ = EXIT_TP
+        elif sl[i] > 0 and ((is_buy[i] and price <= sl[i]) or (not is_buy[i] and price >= sl[i])):
+            exit_ = EXIT_SL
+
+        prices_out[i] = price
+        profits_out[i] = profit
+        exits_out[i] = exit_
+
+    return total_profit, total_margin
+
+PENDING_WAIT = 0 # not triggered yet
+PENDING_EXPIRED = 1
+PENDING_FILL_BUY = 2 # becomes a buy position
+PENDING_FILL_SELL = 3 # becomes a sell position
+PENDING_STOP_LIMIT = 4 # becomes a limit order at its stop limit price
+
+@njit(cache=True)
+def monitor_orders(types, opens, expirations, symbol_ids, sym_bid, sym_ask, sym_time, actions_out, prices_out):
+
+    """A single pass over the pending orders against their symbols' latest ticks.
+
+    Writes what happens to each order into actions_out (PENDING_*) and the price a filled order deals at into prices_out,
+    stops fill at the market while limits fill at their own price. Returns the number of expired orders.
+    """
+
+    expired = 0
+
+    for i in range(types.size):
+        symbol_id = symbol_ids[i]
+        order_type = types[i]
+        price_open = opens[i]
+        ask = sym_ask[symbol_id]
+        bid = sym_bid[symbol_id]
+
+        action = PENDING_WAIT
+        price = price_open
+
+        if expirations[i] > 0 and expirations[i] <= sym_time[symbol_id]:
+            action = PENDING_EXPIRED
+            expired += 1
+        elif order_type == ORDER_TYPE_BUY_LIMIT:
+            if ask <= price_open:
+                action = PENDING_FILL_BUY
+        elif order_type == ORDER_TYPE_BUY_STOP:
+            if ask >= price_open:
+                action, price = PENDING_FILL_BUY, ask
+        elif order_type == ORDER_TYPE_SELL_LIMIT:
+            if bid >= price_open:
+                action = PENDING_FILL_SELL
+        elif order_type == ORDER_TYPE_SELL_STOP:
+            if bid <= price_open:
+                action, price = PENDING_FILL_SELL, bid
+        elif order_type == ORDER_TYPE_BUY_STOP_LIMIT:
+            if ask >= price_open:
+                action = PENDING_STOP_LIMIT
+        elif order_type == ORDER_TYPE_SELL_STOP_LIMIT:
+            if bid <= price_open:
+                action = PENDING_STOP_LIMIT
+
+        actions_out[i] = action
+        prices_out[i] = price
+
+    return expired
+
+def warmup():
+
+    """Compiles (or loads from cache) every kernel so that the cost isn't paid by the first real request"""
+
+    times = np.arange(4, dtype=np.int64)
+
+    window_until(times, 2, 2)
+    window_range(times, 1, 2)
+
+    ones = np.ones(1, dtype=np.float64)
+    is_buy = np.ones(1, dtype=np.bool_)
+    exits = np.zeros(1, dtype=np.int8)
+    statics = np.zeros(1, dtype=[("kind", np.int64), ("value", np.float64)]) # symbol statics are gathered fields of a structured array
+
+    monitor_positions(is_buy, ones, ones, ones, ones, ones, ones, ones, ones, statics["kind"], statics["value"], statics["value"],
+                      statics["value"], statics["value"], statics["value"], ones.copy(), ones.copy(), exits)
+
+    ints = np.zeros(1, dtype=np.int32)
+    times = np.zeros(1, dtype=np.int64)
+    monitor_orders(ints, ones, times, ints, ones, ones, times, exits, ones.copy())
@@ -1,6 +1,8 @@
 import MetaTrader5 as mt5
 from datetime import datetime, timezone, timedelta
 import os
+import functools
+import numpy as np
 import polars as pl
 from strategytester5 import *
 
@@ -18,6 +20,34 @@ def bars_to_polars(bars):
     })
         
 
+@functools.lru_cache(maxsize=256)
+def load_bars(path: str) -> tuple[np.ndarray, np.ndarray]:
+    
+    """Reads bars stored in a parquet directory once per process and shares them across StrategyTester instances.
+    
+    Returns:
+        Time-sorted bars as a numpy structured array (like the one returned by MetaTrader5's copy_rates_*), alongside a contiguous copy of their time column in seconds (used for binary searching).
+    """
+    
+    df = pl.read_parquet(path, memory_map=True, use_pyarrow=False)
+    
+    if not df["time"].is_sorted(): # each partition is written sorted, but partitions aren't guaranteed to be read in chronological order (e.g. month=10 before month=2)
+        df = df.sort("time")
+    
+    rates = df.select([
+        pl.col("time").dt.epoch("s").cast(pl.Int64),
+        
+        pl.col("open").cast(pl.Float64),
+        pl.col("high").cast(pl.Float64),
+        pl.col("low").cast(pl.Float64),
+        pl.col("close").cast(pl.Float64),
+        pl.col("tick_volume").cast(pl.UInt64),
+        pl.col("spread").cast(pl.Int32),
+        pl.col("real_volume").cast(pl.UInt64),
+    ]).to_numpy(structured=True) # columns are cast to RATES_DTYPE, so they're copied into the records in a single pass
+    
+    return rates, np.ascontiguousarray(rates["time"])
+
 def fetch_historical_bars(symbol: str,
                         timeframe: int,
                         start_datetime: datetime,
@@ -76,7 +106,7 @@ def fetch_historical_bars(symbol: str,
             current = (month_start + timedelta(days=32)).replace(day=1)
             continue
 
-        df = bars_to_polars(rates)
+        df = bars_to_polars(rates).sort("time") # stored sorted, so that loading rarely has to sort
 
         df = df.with_columns(
             pl.from_epoch("time", time_unit="s")
@@ -102,6 +132,8 @@ def fetch_historical_bars(symbol: str,
 
         current = (month_start + timedelta(days=32)).replace(day=1)
 
+    load_bars.cache_clear() # history on disk has changed
+    
     if not dfs:
         return pl.DataFrame()
 
@@ -1,6 +1,8 @@
 import MetaTrader5 as mt5
 from datetime import datetime, timezone, timedelta
 import os
+import functools
+import numpy as np
 import polars as pl
 from strategytester5 import *
 
@@ -16,6 +18,34 @@ def ticks_to_polars(ticks):
         "volume_real": ticks["volume_real"],
     })
     
+@functools.lru_cache(maxsize=256)
+def load_ticks(path: str) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    
+    """Reads ticks stored in a parquet directory once per process and shares them across StrategyTester instances.
+    
+    Returns:
+        Time-sorted ticks as a numpy structured array (like the one returned by MetaTrader5's copy_ticks_*), alongside contiguous copies of their time column in seconds (used for binary searching) and their flags (used for masking ticks by type).
+    """
+    
+    df = pl.read_parquet(path, memory_map=True, use_pyarrow=False)
+    
+    if not (df["time"].is_sorted() and df["time_msc"].is_sorted()): # each partition is written sorted, but partitions aren't guaranteed to be read in chronological order (e.g. month=10 before month=2)
+        df = df.sort(["time", "time_msc"])
+    
+    ticks = df.select([
+        pl.col("time").dt.epoch("s").cast(pl.Int64),
+        
+        pl.col("bid").cast(pl.Float64),
+        pl.col("ask").cast(pl.Float64),
+        pl.col("last").cast(pl.Float64),
+        pl.col("volume").cast(pl.UInt64),
+        pl.col("time_msc").cast(pl.Int64),
+        pl.col("flags").cast(pl.UInt32),
+        pl.col("volume_real").cast(pl.Float64),
+    ]).to_numpy(structured=True) # columns are cast to TICKS_DTYPE, so they're copied into the records in a single pass
+    
+    return ticks, np.ascontiguousarray(ticks["time"]), np.ascontiguousarray(ticks["flags"])
+
 def fetch_historical_ticks(start_datetime: datetime, 
                         end_datetime: datetime,
                         symbol: str) -> pl.DataFrame:
@@ -69,7 +99,7 @@ def fetch_historical_ticks(start_datetime: datetime,
             current = (month_start + timedelta(days=32)).replace(day=1)
             continue
 
-        df = ticks_to_polars(ticks)
+        df = ticks_to_polars(ticks).sort(["time", "time_msc"]) # stored sorted, so that loading rarely has to sort
 
         df = df.with_columns(
             pl.from_epoch("time", time_unit="s")
@@ -96,6 +126,8 @@ def fetch_historical_ticks(start_datetime: datetime,
 
         current = (month_start + timedelta(days=32)).replace(day=1)
 
+    load_ticks.cache_clear() # history on disk has changed
+    
     if not dfs:
         return pl.DataFrame()
 
@@ -2,6 +2,8 @@ import numpy as np
 import polars as pl
 import os
 from strategytester5 import *
+from strategytester5.hist.ticks import load_ticks
+
 class TicksGen:
     def __init__(self):
         pass
@@ -147,6 +149,8 @@ class TicksGen:
             if return_df:
                 dfs.append(df)
 
+        load_ticks.cache_clear() # history on disk has changed
+        
         if return_df and dfs:
             return pl.concat(dfs, how="vertical")
 
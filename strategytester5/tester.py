@@ -2,22 +2,53 @@ from strategytester5 import *
 # from strategytester import Tick, TradeOrder, TradePosition, TradeDeal, AccountInfo
 
 import MetaTrader5 as mt5
+from MetaTrader5 import ( # constants used on every tick, resolved once
+    POSITION_TYPE_BUY, POSITION_TYPE_SELL,
+    ORDER_TYPE_BUY, ORDER_TYPE_SELL,
+    ORDER_TYPE_BUY_LIMIT, ORDER_TYPE_SELL_LIMIT,
+    ORDER_TYPE_BUY_STOP, ORDER_TYPE_SELL_STOP,
+    ORDER_TYPE_BUY_STOP_LIMIT, ORDER_TYPE_SELL_STOP_LIMIT,
+    ORDER_STATE_PLACED, ORDER_STATE_FILLED, ORDER_FILLING_FOK, ORDER_TIME_GTC,
+    TRADE_ACTION_DEAL, TRADE_ACTION_PENDING, TRADE_ACTION_SLTP, TRADE_ACTION_MODIFY, TRADE_ACTION_REMOVE,
+    TRADE_RETCODE_DONE, TRADE_RETCODE_INVALID,
+    DEAL_TYPE_BUY, DEAL_TYPE_SELL, DEAL_TYPE_BALANCE, DEAL_ENTRY_IN, DEAL_ENTRY_OUT,
+    DEAL_REASON_EXPERT, DEAL_REASON_SL, DEAL_REASON_TP,
+    SYMBOL_CALC_MODE_FOREX, SYMBOL_CALC_MODE_FOREX_NO_LEVERAGE,
+    SYMBOL_CALC_MODE_CFD, SYMBOL_CALC_MODE_CFDINDEX, SYMBOL_CALC_MODE_CFDLEVERAGE,
+    SYMBOL_CALC_MODE_EXCH_STOCKS, SYMBOL_CALC_MODE_EXCH_STOCKS_MOEX,
+    SYMBOL_CALC_MODE_FUTURES, SYMBOL_CALC_MODE_EXCH_FUTURES,
+    SYMBOL_CALC_MODE_EXCH_BONDS, SYMBOL_CALC_MODE_EXCH_BONDS_MOEX, SYMBOL_CALC_MODE_SERV_COLLATERAL,
+    COPY_TICKS_ALL, COPY_TICKS_INFO, COPY_TICKS_TRADE,
+    TICK_FLAG_BID, TICK_FLAG_ASK, TICK_FLAG_LAST, TICK_FLAG_VOLUME, TICK_FLAG_BUY, TICK_FLAG_SELL,
+)
 from . import error_description
 from datetime import datetime, timedelta, timezone
-import secrets
 import time
 import os
+import math
 import numpy as np
 import fnmatch
-from typing import Optional, Tuple
-from collections import namedtuple
+import functools
+import operator
+import itertools
+import re
+from typing import Callable, Optional, Tuple
+from collections import namedtuple, defaultdict
 import polars as pl
 from strategytester5.validators._trade import TradeValidators
 from strategytester5.validators._tester_configs import TesterConfigValidators
 from strategytester5._template import html_report_template
+from strategytester5._kernels import window_until, window_range, warmup as warmup_kernels
+from strategytester5._kernels import monitor_positions, EXIT_TP, EXIT_SL
+from strategytester5._kernels import monitor_orders, PENDING_WAIT, PENDING_EXPIRED, PENDING_FILL_BUY, PENDING_FILL_SELL, PENDING_STOP_LIMIT
+from strategytester5._kernels import JIT_ENABLED, PROFIT_BY_CONTRACT, PROFIT_BY_TICKS, PROFIT_BONDS
+from strategytester5._history import HistoryTable, DEALS_HISTORY_DTYPE, ORDERS_HISTORY_DTYPE
+from strategytester5._book import OpenBook, POSITIONS_BOOK_FIELDS, ORDERS_BOOK_FIELDS
 import sys
 
 from strategytester5.hist import ticks, bars
+from strategytester5.hist.bars import load_bars
+from strategytester5.hist.ticks import load_ticks
 from strategytester5.hist.ticks_gen import TicksGen
 
 from tqdm import tqdm
@@ -28,6 +59,191 @@ mpl.rcParams["agg.path.chunksize"] = 10000
 mpl.rcParams["path.simplify"] = True
 mpl.rcParams["path.simplify_threshold"] = 0.1
 
+# returned when bars or ticks couldn't be obtained, read-only as they are shared
+_EMPTY_RATES = np.empty(0, dtype=RATES_DTYPE)
+_EMPTY_RATES.flags.writeable = False
+
+_EMPTY_TICKS = np.empty(0, dtype=TICKS_DTYPE)
+_EMPTY_TICKS.flags.writeable = False
+
+TICK_RECORDS_DTYPE = np.dtype( # what _tick_records produces, unlike TICKS_DTYPE the volumes and flags are kept as int64 the way make_tick casts them
+    [
+        ("time", "<i8"),
+        ("bid", "<f8"),
+        ("ask", "<f8"),
+        ("last", "<f8"),
+        ("volume", "<i8"),
+        ("time_msc", "<i8"),
+        ("flags", "<i8"),
+        ("volume_real", "<i8"),
+    ]
+)
+
+_account_fields = operator.attrgetter(*AccountInfo._fields) # AccountState -> the values of its AccountInfo snapshot
+
+_SYNCED_POSITION_FIELDS = tuple(TradePosition._fields.index(name) for name in ("price_current", "profit", "time_update", "time_update_msc")) # refreshed by __sync_positions
+
+
+SYMBOL_STATICS_DTYPE = np.dtype(
+    [
+        ("calc_mode", "<i4"),
+        ("digits", "<i4"),
+        ("contract_size", "<f8"),
+        ("tick_size", "<f8"),
+        ("tick_value", "<f8"),
+        ("margin_initial", "<f8"),
+        ("face_value", "<f8"),
+        ("accrued_interest", "<f8"),
+        ("profit_kind", "<i8"), # PROFIT_* of the bulk profit kernel
+        ("profit_factor", "<f8"),
+        ("margin_a", "<f8"), # margin = a * volume * price + b * volume
+        ("margin_b", "<f8"),
+    ]
+) # symbol properties that don't change during a test, one row per symbol id
+
+def _margin_coefficients(sym: namedtuple, leverage: int) -> Optional[tuple[float, float]]:
+    
+    """Coefficients (a, b) such that a position's margin is a * volume * price + b * volume, None for unknown calc modes.
+    
+    Every calc mode's margin formula is linear in either volume * price or volume, e.g. FOREX is volume * contract size * price / leverage.
+    """
+    
+    contract_size = sym.trade_contract_size
+    
+    margin_rate = sym.margin_initial if sym.margin_initial > 0 else sym.margin_maintenance
+    if margin_rate <= 0: # if margin rate is zero set it to 1
+        margin_rate = 1.0
+    
+    mode = sym.trade_calc_mode
+    
+    if mode == SYMBOL_CALC_MODE_FOREX:
+        return contract_size / leverage, 0.0
+    
+    if mode == SYMBOL_CALC_MODE_FOREX_NO_LEVERAGE:
+        return contract_size, 0.0
+    
+    if mode in (SYMBOL_CALC_MODE_CFD, 
+                SYMBOL_CALC_MODE_CFDINDEX, 
+                SYMBOL_CALC_MODE_EXCH_STOCKS, 
+                SYMBOL_CALC_MODE_EXCH_STOCKS_MOEX):
+        return contract_size * margin_rate, 0.0
+    
+    if mode == SYMBOL_CALC_MODE_CFDLEVERAGE:
+        return contract_size * margin_rate / leverage, 0.0
+    
+    if mode in (SYMBOL_CALC_MODE_FUTURES, 
+                SYMBOL_CALC_MODE_EXCH_FUTURES):
+                # SYMBOL_CALC_MODE_EXCH_FUTURES_FORTS
+        return 0.0, sym.margin_initial
+    
+    if mode in (SYMBOL_CALC_MODE_EXCH_BONDS, 
+                SYMBOL_CALC_MODE_EXCH_BONDS_MOEX):
+        return contract_size * sym.trade_face_value / 100, 0.0
+    
+    if mode == SYMBOL_CALC_MODE_SERV_COLLATERAL:
+        return 0.0, 0.0
+    
+    return None
+
+@functools.lru_cache(maxsize=64)
+def _glob_re(pattern: str) -> re.Pattern:
+    
+    """Compiles a group filter such as "*USD*" once, matching symbols the same way fnmatch.fnmatch does."""
+    
+    flags = re.IGNORECASE if os.path.normcase("A") == "a" else 0 # fnmatch is case-insensitive on Windows
+    return re.compile(fnmatch.translate(pattern), flags)
+
+@functools.lru_cache(maxsize=4096)
+def _glob_match(pattern: str, symbol: str) -> bool:
+    
+    """Whether a symbol belongs to a group filter, memoized as the same few symbols are matched over and over."""
+    
+    return _glob_re(pattern).match(symbol) is not None
+
+def _deal_reason(price: float, sl: float, tp: float, eps: float) -> int:
+    
+    """A deal's reason, whether its price is the stop loss, the take profit or neither (both within eps)."""
+    
+    if abs(price - sl) <= eps:
+        return DEAL_REASON_SL
+    
+    if abs(price - tp) <= eps:
+        return DEAL_REASON_TP
+    
+    return DEAL_REASON_EXPERT
+
+@functools.lru_cache(maxsize=512)
+def _dt_to_ts(dt: datetime) -> int:
+    
+    """Seconds since epoch of a datetime (naive ones are taken as UTC), memoized as history queries tend to repeat the same bounds on every tick."""
+    
+    return int(ensure_utc(dt).timestamp())
+
+def _margin_function(a: float, b: float) -> Callable[[float, float], float]:
+    
+    """margin(volume, price) of a symbol with its coefficients bound as constants, the term that is always zero is left out"""
+    
+    if b == 0:
+        return lambda volume, price: a * volume * price
+    
+    if a == 0:
+        return lambda volume, price: b * volume
+    
+    return lambda volume, price: a * volume * price + b * volume
+
+def _tick_records(df: pl.DataFrame) -> np.ndarray:
+    
+    """Ticks of a history frame as records laid out like Tick, with the conversions make_tick applies to each of them done in one pass:
+    time in seconds, time_msc derived from time and last falling back to bid.
+    """
+    
+    if df.height == 0:
+        return np.empty(0, dtype=TICK_RECORDS_DTYPE)
+    
+    return df.select([
+        pl.col("time").dt.epoch("s").cast(pl.Int64),
+        pl.col("bid").cast(pl.Float64),
+        pl.col("ask").cast(pl.Float64),
+        pl.when(pl.col("last") == 0).then(pl.col("bid")).otherwise(pl.col("last")).cast(pl.Float64).alias("last"),
+        pl.col("volume").cast(pl.Int64),
+        pl.col("time").dt.epoch("ms").cast(pl.Int64).alias("time_msc"),
+        pl.col("flags").cast(pl.Int64),
+        pl.col("volume_real").cast(pl.Int64),
+    ]).to_numpy(structured=True)
+
+def _expiration_ts(expiration) -> int:
+    
+    """A pending order's expiration in seconds since epoch (0 for none), converted once so that it compares with tick times as a plain integer"""
+    
+    if isinstance(expiration, datetime):
+        return _dt_to_ts(expiration)
+    
+    return int(expiration or 0)
+
+def _first_flagged(tick_flags: np.ndarray, start: int, mask: int, count: int) -> np.ndarray:
+    
+    """Rows of the first 'count' ticks from start on whose flags share a bit with mask.
+    
+    The flags are scanned in blocks that double in size, so a request near the beginning of a long history stops once it has enough rows instead of scanning to its end.
+    """
+    
+    found = []
+    missing = count
+    size = tick_flags.size
+    block = max(2 * count, 4096)
+    
+    while start < size and missing > 0:
+        end = min(size, start + block)
+        
+        rows = np.flatnonzero(tick_flags[start:end] & mask)[:missing] + start
+        found.append(rows)
+        missing -= rows.size
+        
+        start = end
+        block *= 2
+    
+    return np.concatenate(found) if found else np.empty(0, dtype=np.int64)
+
 
 class StrategyTester:
     def __init__(self, tester_config: dict, mt5_instance: mt5, logs_dir: Optional[str]="Logs", reports_dir: Optional[str]="Reports", history_dir: Optional[str]="History"):
@@ -45,8 +261,9 @@ class StrategyTester:
         
         
         self.symbol_info_cache: dict[str, namedtuple] = {}
+        self.__eps_by_symbol: dict[str, float] = {} # symbol -> smallest price step (10^-digits), filled alongside symbol_info_cache
         self.tick_cache: dict[str, Tick] = {}
-        
+
         # ---------------- validate all configs from a dictionary -----------------
         
         self.tester_config = TesterConfigValidators.parse_tester_configs(tester_config)
@@ -70,6 +287,8 @@ class StrategyTester:
         global LOGGER
         LOGGER = self.logger
         
+        self.__log_info = self.logger.info # bound once, called by the order_send handlers on every trade
+        
         if not self.IS_TESTER:
             self.logger.debug("MT5 mode")
             
@@ -77,6 +296,12 @@ class StrategyTester:
         
         self.IS_TESTER = not any(arg.startswith("--mt5") for arg in sys.argv) # are we on the strategy tester mode or live trading
         
+        if self.IS_TESTER: # history queries go straight to the simulated history, skipping the live MetaTrader5 branches
+            self.history_orders_total = self.__history_orders_total_tester
+            self.history_orders_get = self.__history_orders_get_tester
+            self.history_deals_total = self.__history_deals_total_tester
+            self.history_deals_get = self.__history_deals_get_tester
+        
         if not self.IS_TESTER:
             self.logger.debug("MT5 mode")
             
@@ -167,10 +392,22 @@ class StrategyTester:
         
         self.AccountInfo = AccountInfo
         
-        self.__orders_container__ = []
-        self.__orders_history_container__ = []
-        self.__positions_container__ = []
-        self.__deals_history_container__ = []
+        self.__orders_container__: dict[int, TradeOrder] = {} # ticket -> order, in insertion order
+        self.__orders_book = OpenBook(ORDERS_BOOK_FIELDS) # numeric fields of the pending orders, for the vectorized monitoring
+        self.__orders_history_container__ = HistoryTable(ORDERS_HISTORY_DTYPE, time_field="time_setup")
+        self.__positions_container__: dict[int, TradePosition] = {} # ticket -> position, in insertion order
+        self.__positions_book = OpenBook(POSITIONS_BOOK_FIELDS) # numeric fields of the open positions, for the vectorized monitoring
+        self.__positions_synced = True # whether the position objects carry the latest monitored prices and profits
+        self.__deals_history_container__ = HistoryTable(DEALS_HISTORY_DTYPE, time_field="time")
+        
+        self.__orders_by_symbol__: dict[str, dict[int, TradeOrder]] = defaultdict(dict)
+        self.__positions_by_symbol__: dict[str, dict[int, TradePosition]] = defaultdict(dict)
+        self.__positions_by_key: dict[tuple, dict[int, TradePosition]] = defaultdict(dict) # (symbol, magic, type) -> positions, for position_exists
+        
+        self.__sum_volume_positions__ = 0.0 # running sums of the open volume, kept by the add/remove helpers below
+        self.__sum_volume_orders__ = 0.0
+        
+        self.__tickets = itertools.count(int(time.time()) << 20) # orders and positions share one counter so their tickets never collide
 
         # ----------------- AccountInfo -----------------
         
@@ -182,7 +419,7 @@ class StrategyTester:
         deposit = self.tester_config["deposit"]
         
         self.__account_state_update(
-            account_info=AccountInfo(
+            account_state=AccountState(
                 # ---- identity / broker-controlled ----
                 login=11223344,
                 trade_mode=mt5_acc_info.trade_mode,
@@ -226,34 +463,63 @@ class StrategyTester:
         self.symbol_info_cache: dict[str, namedtuple] = {}
         self.tick_cache: dict[str, namedtuple] = {}
         
-        self.ORDER_TYPES = [
-            self.mt5_instance.ORDER_TYPE_BUY,
-            self.mt5_instance.ORDER_TYPE_SELL,
-            self.mt5_instance.ORDER_TYPE_BUY_LIMIT,
-            self.mt5_instance.ORDER_TYPE_SELL_LIMIT,
-            self.mt5_instance.ORDER_TYPE_BUY_STOP,
-            self.mt5_instance.ORDER_TYPE_SELL_STOP,
-            self.mt5_instance.ORDER_TYPE_BUY_STOP_LIMIT,
-            self.mt5_instance.ORDER_TYPE_SELL_STOP_LIMIT,
-            self.mt5_instance.ORDER_TYPE_CLOSE_BY
-            ]
-        
-        self.BUY_ACTIONS = {
-            # self.mt5_instance.POSITION_TYPE_BUY,
-            self.mt5_instance.ORDER_TYPE_BUY,
-            self.mt5_instance.ORDER_TYPE_BUY_LIMIT,
-            self.mt5_instance.ORDER_TYPE_BUY_STOP,
-            self.mt5_instance.ORDER_TYPE_BUY_STOP_LIMIT,
-        }
-
-        self.SELL_ACTIONS = {
-            # self.mt5_instance.POSITION_TYPE_SELL,
-            self.mt5_instance.ORDER_TYPE_SELL,
-            self.mt5_instance.ORDER_TYPE_SELL_LIMIT,
-            self.mt5_instance.ORDER_TYPE_SELL_STOP,
-            self.mt5_instance.ORDER_TYPE_SELL_STOP_LIMIT,
+        self.ORDER_TYPES = ORDER_TYPES
+        self.BUY_ACTIONS = BUY_ACTIONS
+        self.SELL_ACTIONS = SELL_ACTIONS
+        
+        self.__profit_calculators = {} # trade calc mode -> profit formula
+        for mode in (SYMBOL_CALC_MODE_FOREX,
+                     SYMBOL_CALC_MODE_FOREX_NO_LEVERAGE,
+                     SYMBOL_CALC_MODE_CFD,
+                     SYMBOL_CALC_MODE_CFDINDEX,
+                     SYMBOL_CALC_MODE_CFDLEVERAGE,
+                     SYMBOL_CALC_MODE_EXCH_STOCKS,
+                     SYMBOL_CALC_MODE_EXCH_STOCKS_MOEX):
+            self.__profit_calculators[mode] = self.__profit_by_contract
+        
+        for mode in (SYMBOL_CALC_MODE_FUTURES,
+                     SYMBOL_CALC_MODE_EXCH_FUTURES):
+                     # SYMBOL_CALC_MODE_EXCH_FUTURES_FORTS
+            self.__profit_calculators[mode] = self.__profit_by_ticks
+        
+        for mode in (SYMBOL_CALC_MODE_EXCH_BONDS,
+                     SYMBOL_CALC_MODE_EXCH_BONDS_MOEX):
+            self.__profit_calculators[mode] = self.__profit_bonds
+        
+        self.__profit_calculators[SYMBOL_CALC_MODE_SERV_COLLATERAL] = self.__profit_collateral
+        
+        self.__validators_by_symbol: dict[str, TradeValidators] = {}
+        
+        self.__order_send_handlers = { # trade action -> handler
+            TRADE_ACTION_DEAL: self.__order_send_deal,
+            TRADE_ACTION_PENDING: self.__order_send_pending,
+            TRADE_ACTION_SLTP: self.__order_send_sltp,
+            TRADE_ACTION_MODIFY: self.__order_send_modify,
+            TRADE_ACTION_REMOVE: self.__order_send_remove,
         }
         
+        self.__profit_params: dict[str, tuple] = {} # symbol -> (kind, factor, face value, accrued interest) for the bulk profit kernel
+        
+        self.__symbol_ids: dict[str, int] = {} # symbol -> index into the per symbol arrays below
+        self.__sym_bid = np.empty(0, dtype=np.float64) # latest prices, written by TickUpdate
+        self.__sym_ask = np.empty(0, dtype=np.float64)
+        self.__sym_time = np.empty(0, dtype=np.int64)
+        self.__sym_time_msc = np.empty(0, dtype=np.int64)
+        self.__symbol_statics = np.empty(0, dtype=SYMBOL_STATICS_DTYPE)
+        self.__margin_functions: dict[str, Callable[[float, float], float]] = {} # symbol -> its order_calc_margin formula, specialized on registration
+        
+        self.__flag_masks: dict[int, int] = {} # COPY_TICKS flags -> TICK_FLAG mask
+        for flags in (COPY_TICKS_ALL, 
+                      COPY_TICKS_INFO, 
+                      COPY_TICKS_TRADE, 
+                      COPY_TICKS_INFO | COPY_TICKS_TRADE):
+            self.__flag_masks[flags] = self.__compute_tick_flag_mask(flags)
+        
+        self.__bars_paths: dict[tuple[str, int], str] = {} # (symbol, timeframe) -> bars history directory
+        self.__ticks_paths: dict[str, str] = {} # symbol -> ticks history directory
+        
+        warmup_kernels() # compile the history slicing kernels before the first request
+        
         # -------------------- tester reports ----------------------------
         
         self.last_curve_minute = -1
@@ -284,16 +550,20 @@ class StrategyTester:
         self.tester_curves["equity"].append(self.AccountInfo.equity)
         self.tester_curves["margin"].append(self.AccountInfo.margin)
     
-    def __account_state_update(self, account_info: namedtuple):
+    def __account_state_update(self, account_state: AccountState):
         
-        self.AccountInfo = account_info
+        self.AccountInfo = account_state
+        self.__account_snapshot = None
         
     def account_info(self) -> namedtuple:
         
         """Gets info on the current trading account."""
         
         if self.IS_TESTER:
-            return self.AccountInfo
+            if self.__account_snapshot is None: # built once per change of the account, not on every call
+                self.__account_snapshot = AccountInfo._make(_account_fields(self.AccountInfo))
+            
+            return self.__account_snapshot
         
         mt5_ac_info = self.mt5_instance.account_info()
         if  mt5_ac_info is None:
@@ -306,14 +576,16 @@ class StrategyTester:
         
         """Gets data on the specified financial instrument."""
         
-        if symbol not in self.symbol_info_cache:
+        info = self.symbol_info_cache.get(symbol)
+        if info is None:
             info = self.mt5_instance.symbol_info(symbol)
             if info is None:
                 return None
             
             self.symbol_info_cache[symbol] = info
+            self.__eps_by_symbol[symbol] = pow(10, -info.digits)
         
-        return self.symbol_info_cache[symbol]
+        return info
 
     def symbol_info_tick(self, symbol: str) -> namedtuple:
         """Get the last tick for the specified financial instrument.
@@ -349,23 +621,34 @@ class StrategyTester:
         if isinstance(tick, tuple):
             tick = make_tick_from_tuple(tick)
         
+        self.__set_tick(symbol, self.__symbol_ids.get(symbol), tick)
+    
+    def __set_tick(self, symbol: str, symbol_id: Optional[int], tick: Tick):
+        
+        """Stores an already converted tick, symbol_id is resolved once by the caller so that the tester loop never hashes the symbol for it"""
+        
         self.tick_cache[symbol] = tick
+        
+        if symbol_id is not None:
+            self.__sym_bid[symbol_id] = tick.bid
+            self.__sym_ask[symbol_id] = tick.ask
+            self.__sym_time[symbol_id] = tick.time
+            self.__sym_time_msc[symbol_id] = tick.time_msc
     
-    def __mt5_data_to_dicts(self, rates) -> list[dict]:
+    def __copy_rates_until(self, symbol: str, timeframe: int, time_sec: int, count: int) -> np.ndarray:
         
-        if rates is None or len(rates) == 0:
-            return []
-
-        # structured numpy array from MT5
-        if rates.dtype.names is not None:
-            return [
-                {name: r[name].item() if hasattr(r[name], "item") else r[name]
-                for name in rates.dtype.names}
-                for r in rates
-            ]
-
-        raise TypeError(f"Unsupported rates format: {type(rates)}, dtype={rates.dtype}")
-
+        """Gets the last 'count' stored bars opened at or before time_sec (seconds since 1970.01.01)"""
+        
+        try:
+            rates, times = load_bars(self.__bars_path(symbol, timeframe))
+            
+            start, end = window_until(times, time_sec, count)
+            return rates[start:end].copy() # already sorted oldest -> newest
+        
+        except Exception as e:
+            self.logger.warning(f"Failed to copy rates {e}")
+            return _EMPTY_RATES
+    
     def copy_rates_from(self, symbol: str, timeframe: int, date_from: datetime, count: int) -> np.array:
         
         """Get bars from the MetaTrader 5 terminal starting from the specified date.
@@ -387,44 +670,14 @@ class StrategyTester:
             
             # instead of getting data from MetaTrader 5, get data stored in our custom directories
             
-            path = os.path.join(self.history_dir, "Bars", symbol, TIMEFRAMES_MAP_REVERSE[timeframe])
-            os.makedirs(path, exist_ok=True)
-            
-            lf = pl.scan_parquet(path)
-
-            try:
-                rates = (
-                    lf
-                    .filter(pl.col("time") <= date_from) # get data starting at the given date
-                    .sort("time", descending=True) 
-                    .limit(count) # limit the request to some bars
-                    .select([
-                        pl.col("time").dt.epoch("s").cast(pl.Int64).alias("time"),
-
-                        pl.col("open"),
-                        pl.col("high"),
-                        pl.col("low"),
-                        pl.col("close"),
-                        pl.col("tick_volume"),
-                        pl.col("spread"),
-                        pl.col("real_volume"),
-                    ]) # return only what's required 
-                    .collect(engine="streaming") # the streming engine, doesn't store data in memory
-                ).to_dicts()
-
-                rates = np.array(rates)[::-1] # reverse an array so it becomes oldest -> newest
-            
-            except Exception as e:
-                self.logger.warning(f"Failed to copy rates {e}")
-                return np.array(dict())
+            rates = self.__copy_rates_until(symbol, timeframe, math.floor(date_from.timestamp()), count)
         else:
             
             rates = self.mt5_instance.copy_rates_from(symbol, timeframe, date_from, count)
-            rates = np.array(self.__mt5_data_to_dicts(rates))
             
             if rates is None:
                 self.logger.warning(f"Failed to copy rates. MetaTrader 5 error = {self.mt5_instance.last_error()}")
-                return np.array(dict())
+                return _EMPTY_RATES
             
         return rates
     
@@ -444,28 +697,28 @@ class StrategyTester:
             Returns bars as the numpy array with the named time, open, high, low, close, tick_volume, spread and real_volume columns. Returns None in case of an error. The info on the error can be obtained using last_error().
         """
         
-        tick = self.tick_cache[symbol]
-        
-        if tick is None or tick.time is None:
-            self.logger.critical("Time information not found in the ticker, call the function 'TickUpdate' giving it the latest tick information")
-            now = datetime.now(tz=timezone.utc)
-        else:
-            now = tick.time
-        
         if self.IS_TESTER:    
-            rates = self.copy_rates_from(symbol=symbol, 
-                                        timeframe=timeframe,
-                                        date_from=now+timedelta(seconds=PeriodSeconds(timeframe)*start_pos),
-                                        count=count)
+            
+            tick = self.tick_cache.get(symbol)
+            
+            if tick is None or tick.time is None:
+                self.logger.critical("Time information not found in the ticker, call the function 'TickUpdate' giving it the latest tick information")
+                now = int(time.time())
+            elif isinstance(tick.time, datetime):
+                now = int(ensure_utc(tick.time).timestamp())
+            else:
+                now = int(tick.time)
+            
+            # bars are numbered from present to past, the bar at start_pos is the last one opened at or before this time
+            rates = self.__copy_rates_until(symbol, timeframe, now - PeriodSeconds(timeframe) * start_pos, count)
         
         else:
             
             rates = self.mt5_instance.copy_rates_from_pos(symbol, timeframe, start_pos, count)
-            rates = np.array(self.__mt5_data_to_dicts(rates))
             
             if rates is None:
                 self.logger.warning(f"Failed to copy rates. MetaTrader 5 error = {self.mt5_instance.last_error()}")
-                return np.array(dict())
+                return _EMPTY_RATES
             
         return rates
     
@@ -489,65 +742,73 @@ class StrategyTester:
             
             # instead of getting data from MetaTrader 5, get data stored in our custom directories
             
-            path = os.path.join(self.history_dir, "Bars", symbol, TIMEFRAMES_MAP_REVERSE[timeframe])
-            os.makedirs(path, exist_ok=True)
+            path = self.__bars_path(symbol, timeframe)
             
-            lf = pl.scan_parquet(path)
-
             try:
-                rates = (
-                    lf
-                    .filter(
-                            (pl.col("time") >= pl.lit(date_from)) &
-                            (pl.col("time") <= pl.lit(date_to))
-                        ) # get bars between date_from and date_to
-                    .sort("time", descending=True) 
-                    .select([
-                        pl.col("time").dt.epoch("s").cast(pl.Int64).alias("time"),
-
-                        pl.col("open"),
-                        pl.col("high"),
-                        pl.col("low"),
-                        pl.col("close"),
-                        pl.col("tick_volume"),
-                        pl.col("spread"),
-                        pl.col("real_volume"),
-                    ]) # return only what's required 
-                    .collect(engine="streaming") # the streming engine, doesn't store data in memory
-                ).to_dicts()
-
-                rates = np.array(rates)[::-1] # reverse an array so it becomes oldest -> newest
+                rates, times = load_bars(path)
+                
+                start, end = window_range(times, math.ceil(date_from.timestamp()), math.floor(date_to.timestamp())) # bars opened between date_from and date_to
+                rates = rates[start:end].copy()
             
             except Exception as e:
                 self.logger.warning(f"Failed to copy rates {e}")
-                return np.array(dict())
+                return _EMPTY_RATES
         else:
             
             rates = self.mt5_instance.copy_rates_range(symbol, timeframe, date_from, date_to)
-            rates = np.array(self.__mt5_data_to_dicts(rates))
             
             if rates is None:
                 self.logger.warning(f"Failed to copy rates. MetaTrader 5 error = {self.mt5_instance.last_error()}")
-                return np.array(dict())
+                return _EMPTY_RATES
             
         return rates
 
+    def __bars_path(self, symbol: str, timeframe: int) -> str:
+        
+        path = self.__bars_paths.get((symbol, timeframe))
+        if path is None:
+            path = os.path.abspath(os.path.join(self.history_dir, "Bars", symbol, TIMEFRAMES_MAP_REVERSE[timeframe]))
+            os.makedirs(path, exist_ok=True)
+            
+            self.__bars_paths[(symbol, timeframe)] = path
+        
+        return path
+    
+    def __ticks_path(self, symbol: str) -> str:
+        
+        path = self.__ticks_paths.get(symbol)
+        if path is None:
+            path = os.path.abspath(os.path.join(self.history_dir, "Ticks", symbol))
+            os.makedirs(path, exist_ok=True)
+            
+            self.__ticks_paths[symbol] = path
+        
+        return path
+    
     def __tick_flag_mask(self, flags: int) -> int:
-        if flags == self.mt5_instance.COPY_TICKS_ALL:
+        
+        mask = self.__flag_masks.get(flags)
+        if mask is None:
+            mask = self.__flag_masks[flags] = self.__compute_tick_flag_mask(flags)
+        
+        return mask
+    
+    def __compute_tick_flag_mask(self, flags: int) -> int:
+        if flags == COPY_TICKS_ALL:
             return (
-                self.mt5_instance.TICK_FLAG_BID
-                | self.mt5_instance.TICK_FLAG_ASK
-                | self.mt5_instance.TICK_FLAG_LAST
-                | self.mt5_instance.TICK_FLAG_VOLUME
-                | self.mt5_instance.TICK_FLAG_BUY
-                | self.mt5_instance.TICK_FLAG_SELL
+                TICK_FLAG_BID
+                | TICK_FLAG_ASK
+                | TICK_FLAG_LAST
+                | TICK_FLAG_VOLUME
+                | TICK_FLAG_BUY
+                | TICK_FLAG_SELL
             )
 
         mask = 0
-        if flags & self.mt5_instance.COPY_TICKS_INFO:
-            mask |= self.mt5_instance.TICK_FLAG_BID | self.mt5_instance.TICK_FLAG_ASK
-        if flags & self.mt5_instance.COPY_TICKS_TRADE:
-            mask |= self.mt5_instance.TICK_FLAG_LAST | self.mt5_instance.TICK_FLAG_VOLUME
+        if flags & COPY_TICKS_INFO:
+            mask |= TICK_FLAG_BID | TICK_FLAG_ASK
+        if flags & COPY_TICKS_TRADE:
+            mask |= TICK_FLAG_LAST | TICK_FLAG_VOLUME
 
         return mask
 
@@ -571,48 +832,24 @@ class StrategyTester:
 
         if self.IS_TESTER:    
             
-            path = os.path.join(self.history_dir, "Ticks", symbol)
-            os.makedirs(path, exist_ok=True)
+            path = self.__ticks_path(symbol)
             
-            lf = pl.scan_parquet(path)
-
             try:
-                ticks = (
-                    lf
-                    .filter(pl.col("time") >= pl.lit(date_from)) # get data starting at the given date
-                    .filter((pl.col("flags") & flag_mask) != 0)
-                    .sort(
-                        ["time", "time_msc"],
-                        descending=[False, False]
-                    )
-                    .limit(count) # limit the request to a specified number of ticks
-                    .select([
-                        pl.col("time").dt.epoch("s").cast(pl.Int64).alias("time"),
-
-                        pl.col("bid"),
-                        pl.col("ask"),
-                        pl.col("last"),
-                        pl.col("volume"),
-                        pl.col("time_msc"),
-                        pl.col("flags"),
-                        pl.col("volume_real"),
-                    ]) 
-                    .collect(engine="streaming") # the streaming engine, doesn't store data in memory
-                ).to_dicts()
-
-                ticks = np.array(ticks)
+                ticks, times, tick_flags = load_ticks(path)
+                
+                start = int(np.searchsorted(times, math.ceil(date_from.timestamp()), side="left")) # first tick at or after the given date
+                ticks = ticks[_first_flagged(tick_flags, start, flag_mask, count)]
             
             except Exception as e:
                 self.logger.warning(f"Failed to copy ticks {e}")
-                return np.array(dict())
+                return _EMPTY_TICKS
         else:
             
             ticks = self.mt5_instance.copy_ticks_from(symbol, date_from, count, flags)
-            ticks = np.array(self.__mt5_data_to_dicts(ticks))
             
             if ticks is None:
                 self.logger.warning(f"Failed to copy ticks. MetaTrader 5 error = {self.mt5_instance.last_error()}")
-                return np.array(dict())
+                return _EMPTY_TICKS
             
         return ticks
     
@@ -639,50 +876,26 @@ class StrategyTester:
 
         if self.IS_TESTER:    
             
-            path = os.path.join(self.history_dir, "Ticks", symbol)
-            os.makedirs(path, exist_ok=True)
+            path = self.__ticks_path(symbol)
             
-            lf = pl.scan_parquet(path)
-
             try:
-                ticks = (
-                    lf
-                    .filter(
-                            (pl.col("time") >= pl.lit(date_from)) &
-                            (pl.col("time") <= pl.lit(date_to))
-                        ) # get ticks between date_from and date_to
-                    .filter((pl.col("flags") & flag_mask) != 0)
-                    .sort(
-                        ["time", "time_msc"],
-                        descending=[False, False]
-                    )
-                    .select([
-                        pl.col("time").dt.epoch("s").cast(pl.Int64).alias("time"),
-
-                        pl.col("bid"),
-                        pl.col("ask"),
-                        pl.col("last"),
-                        pl.col("volume"),
-                        pl.col("time_msc"),
-                        pl.col("flags"),
-                        pl.col("volume_real"),
-                    ]) 
-                    .collect(engine="streaming") # the streaming engine, doesn't store data in memory
-                ).to_dicts()
-
-                ticks = np.array(ticks)
+                ticks, times, tick_flags = load_ticks(path)
+                
+                start, end = window_range(times, math.ceil(date_from.timestamp()), math.floor(date_to.timestamp())) # get ticks between date_from and date_to
+                
+                rows = np.flatnonzero(tick_flags[start:end] & flag_mask) + start
+                ticks = ticks[rows]
             
             except Exception as e:
                 self.logger.warning(f"Failed to copy ticks {e}")
-                return np.array(dict())
+                return _EMPTY_TICKS
         else:
             
             ticks = self.mt5_instance.copy_ticks_range(symbol, date_from, date_to, flags)
-            ticks = np.array(self.__mt5_data_to_dicts(ticks))
             
             if ticks is None:
                 self.logger.warning(f"Failed to copy ticks. MetaTrader 5 error = {self.mt5_instance.last_error()}")
-                return np.array(dict())
+                return _EMPTY_TICKS
             
         return ticks
     
@@ -704,7 +917,7 @@ class StrategyTester:
         
         return total
     
-    def orders_get(self, symbol: Optional[str] = None, group: Optional[str] = None, ticket: Optional[int] = None) -> namedtuple:
+    def orders_get(self, symbol: Optional[str] = None, group: Optional[str] = None, ticket: Optional[int] = None) -> Optional[tuple[TradeOrder, ...]]:
                 
         """Get active orders with the ability to filter by symbol or ticket. There are three call options.
 
@@ -716,7 +929,7 @@ class StrategyTester:
         
         Returns:
         
-            list: Returns info in the form of a named tuple structure (namedtuple). Return None in case of an error. The info on the error can be obtained using last_error().
+            tuple: Returns the orders as a tuple of TradeOrder namedtuples. Return None in case of an error. The info on the error can be obtained using last_error().
         """
         
         if self.IS_TESTER:
@@ -725,19 +938,21 @@ class StrategyTester:
 
             # no filters → return all orders
             if symbol is None and group is None and ticket is None:
-                return tuple(orders)
+                return tuple(orders.values())
 
             # symbol filter (highest priority)
             if symbol is not None:
-                return tuple(o for o in orders if o.symbol == symbol)
+                return tuple(self.__orders_by_symbol__.get(symbol, {}).values())
 
             # group filter
             if group is not None:
-                return tuple(o for o in orders if fnmatch.fnmatch(o.symbol, group))
+                symbols = {sym for sym, bucket in self.__orders_by_symbol__.items() if bucket and _glob_match(group, sym)} # match each symbol once
+                return tuple([o for o in orders.values() if o.symbol in symbols])
 
             # ticket filter
             if ticket is not None:
-                return tuple(o for o in orders if o.ticket == ticket)
+                order = orders.get(ticket)
+                return (order,) if order is not None else tuple()
 
             return tuple()
         
@@ -774,7 +989,7 @@ class StrategyTester:
         
         return total
 
-    def positions_get(self, symbol: Optional[str] = None, group: Optional[str] = None, ticket: Optional[int] = None) -> namedtuple:
+    def positions_get(self, symbol: Optional[str] = None, group: Optional[str] = None, ticket: Optional[int] = None) -> Optional[tuple[TradePosition, ...]]:
         
         """Get open positions with the ability to filter by symbol or ticket. There are three call options.
 
@@ -786,28 +1001,31 @@ class StrategyTester:
         
         Returns:
         
-            list: Returns info in the form of a named tuple structure (namedtuple). Return None in case of an error. The info on the error can be obtained using last_error().
+            tuple: Returns the positions as a tuple of TradePosition namedtuples. Return None in case of an error. The info on the error can be obtained using last_error().
         """
         
         if self.IS_TESTER:
             
+            self.__sync_positions()
             positions = self.__positions_container__
 
             # no filters → return all positions
             if symbol is None and group is None and ticket is None:
-                return tuple(positions)
+                return tuple(positions.values())
 
             # symbol filter (highest priority)
             if symbol is not None:
-                return tuple(o for o in positions if o.symbol == symbol)
+                return tuple(self.__positions_by_symbol__.get(symbol, {}).values())
 
             # group filter
             if group is not None:
-                return tuple(o for o in positions if fnmatch.fnmatch(o.symbol, group))
+                symbols = {sym for sym, bucket in self.__positions_by_symbol__.items() if bucket and _glob_match(group, sym)} # match each symbol once
+                return tuple([o for o in positions.values() if o.symbol in symbols])
 
             # ticket filter
             if ticket is not None:
-                return tuple(o for o in positions if o.ticket == ticket)
+                position = positions.get(ticket)
+                return (position,) if position is not None else tuple()
 
             return tuple()
         
@@ -826,6 +1044,28 @@ class StrategyTester:
         except Exception as e:
             self.logger.error(f"MetaTrader5 error = {e}")
             return None
+    
+    def position_exists(self, symbol: str, magic: int, type: int) -> bool:
+        
+        """Checks whether a position of the given type and magic number is open on a symbol.
+
+        Args:
+            symbol (str): Symbol name.
+            magic (int): Expert Advisor ID (magic number) the position was opened with.
+            type (int): Position type, POSITION_TYPE_BUY or POSITION_TYPE_SELL.
+
+        Returns:
+            bool: True if such a position exists, a single lookup in the tester instead of scanning the open positions.
+        """
+        
+        if self.IS_TESTER:
+            return bool(self.__positions_by_key.get((symbol, magic, type)))
+        
+        positions = self.positions_get(symbol=symbol)
+        if positions is None:
+            return False
+        
+        return any(position.magic == magic and position.type == type for position in positions)
 
     def history_orders_total(self, date_from: datetime, date_to: datetime) -> int:
         
@@ -839,15 +1079,7 @@ class StrategyTester:
         date_to = ensure_utc(date_to)
         
         if self.IS_TESTER:
-        
-            date_from_ts = int(date_from.timestamp())
-            date_to_ts   = int(date_to.timestamp())
-            
-            return sum(
-                        1
-                        for o in self.__orders_history_container__
-                        if date_from_ts <= o.time_setup <= date_to_ts
-                    )
+            return self.__history_orders_total_tester(date_from, date_to)
 
         try:
             total = self.mt5_instance.history_orders_total(date_from, date_to)
@@ -857,47 +1089,34 @@ class StrategyTester:
         
         return total
     
+    def __history_orders_total_tester(self, date_from: datetime, date_to: datetime) -> int:
+        
+        """history_orders_total on the simulated history, bound in place of the public method in tester mode"""
+        
+        if date_from is None or date_to is None:
+            self.logger.error("date_from and date_to must be specified")
+            return None
+        
+        date_from_ts = _dt_to_ts(date_from)
+        date_to_ts   = _dt_to_ts(date_to)
+        
+        return self.__orders_history_container__.count_between(date_from_ts, date_to_ts)
+    
     def history_orders_get(self, 
                            date_from: datetime,
                            date_to: datetime,
                            group: Optional[str] = None,
                            ticket: Optional[int] = None,
                            position: Optional[int] = None
-                           ) -> namedtuple:
+                           ) -> Optional[tuple[TradeOrder, ...]]:
+        """Gets orders from trading history within the specified interval with the ability to filter by ticket or position.
+
+        Returns:
+            tuple: the history orders as a tuple of TradeOrder namedtuples, None in case of an error
+        """
         
         if self.IS_TESTER:
-
-            orders = self.__orders_history_container__
-
-            # ticket filter (highest priority)
-            if ticket is not None:
-                return tuple(o for o in orders if o.ticket == ticket)
-
-            # position filter
-            if position is not None:
-                return tuple(o for o in orders if o.position_id == position)
-
-            # date range is a requirement  
-            if date_from is None or date_to is None:
-                self.logger.error("date_from and date_to must be specified")
-                return None
-
-            date_from_ts = int(ensure_utc(date_from).timestamp())
-            date_to_ts   = int(ensure_utc(date_to).timestamp())
-
-            filtered = (
-                o for o in orders
-                if date_from_ts <= o.time_setup <= date_to_ts
-            ) # obtain orders that fall within this time range
-
-            # optional group filter
-            if group is not None:
-                filtered = (
-                    o for o in filtered
-                    if fnmatch.fnmatch(o.symbol, group)
-                )
-
-            return tuple(filtered)
+            return self.__history_orders_get_tester(date_from, date_to, group, ticket, position)
     
         try: # we are not on the strategy tester simulation
             
@@ -924,6 +1143,44 @@ class StrategyTester:
             self.logger.error(f"MetaTrader5 error = {e}")
             return None
     
+    def __history_orders_get_tester(self,
+                                    date_from: datetime,
+                                    date_to: datetime,
+                                    group: Optional[str] = None,
+                                    ticket: Optional[int] = None,
+                                    position: Optional[int] = None
+                                    ) -> tuple:
+        
+        """history_orders_get on the simulated history, bound in place of the public method in tester mode"""
+        
+        orders = self.__orders_history_container__
+
+        # ticket filter (highest priority)
+        if ticket is not None:
+            order = orders.get(ticket)
+            return (order,) if order is not None else tuple()
+
+        # position filter
+        if position is not None:
+            return tuple(orders.by_position.get(position, ()))
+
+        # date range is a requirement  
+        if date_from is None or date_to is None:
+            self.logger.error("date_from and date_to must be specified")
+            return None
+
+        date_from_ts = _dt_to_ts(date_from)
+        date_to_ts   = _dt_to_ts(date_to)
+
+        # optional group filter, only the symbols matching it are visited
+        symbols = None
+        if group is not None:
+            symbols = [sym for sym in orders.by_symbol if _glob_match(group, sym)]
+
+        filtered = orders.between(date_from_ts, date_to_ts, symbols) # obtain orders that fall within this time range
+
+        return tuple(filtered)
+    
     def history_deals_total(self, date_from: datetime, date_to: datetime) -> int:
         """
         Get the number of deals in history within the specified date range.
@@ -945,15 +1202,7 @@ class StrategyTester:
         date_to   = ensure_utc(date_to)
 
         if self.IS_TESTER:
-
-            date_from_ts = int(date_from.timestamp())
-            date_to_ts   = int(date_to.timestamp())
-
-            return sum(
-                1
-                for d in self.__deals_history_container__
-                if date_from_ts <= d.time <= date_to_ts
-            )
+            return self.__history_deals_total_tester(date_from, date_to)
 
         try:
             return self.mt5_instance.history_deals_total(date_from, date_to)
@@ -962,13 +1211,26 @@ class StrategyTester:
             self.logger.error(f"MetaTrader5 error = {e}")
             return -1
     
+    def __history_deals_total_tester(self, date_from: datetime, date_to: datetime) -> int:
+        
+        """history_deals_total on the simulated history, bound in place of the public method in tester mode"""
+        
+        if date_from is None or date_to is None:
+            self.logger.error("date_from and date_to must be specified")
+            return -1
+        
+        date_from_ts = _dt_to_ts(date_from)
+        date_to_ts   = _dt_to_ts(date_to)
+        
+        return self.__deals_history_container__.count_between(date_from_ts, date_to_ts)
+    
     def history_deals_get(self,
                           date_from: datetime,
                           date_to: datetime,
                           group: Optional[str] = None,
                           ticket: Optional[int] = None,
                           position: Optional[int] = None
-                        ) -> namedtuple:
+                        ) -> Optional[tuple[TradeDeal, ...]]:
         """Gets deals from trading history within the specified interval with the ability to filter by ticket or position.
 
         Args:
@@ -986,42 +1248,11 @@ class StrategyTester:
             ValueError: MetaTrader5 error
 
         Returns:
-            namedtuple: information about deals
+            tuple: the deals as a tuple of TradeDeal namedtuples, None in case of an error
         """
                 
         if self.IS_TESTER:
-
-            deals = self.__deals_history_container__
-
-            # ticket filter (highest priority)
-            if ticket is not None:
-                return tuple(d for d in deals if d.ticket == ticket)
-
-            # position filter
-            if position is not None:
-                return tuple(d for d in deals if d.position_id == position)
-
-            # date range is a requirement  
-            if date_from is None or date_to is None:
-                self.logger.error("date_from and date_to must be specified")
-                return None
-
-            date_from_ts = int(ensure_utc(date_from).timestamp())
-            date_to_ts   = int(ensure_utc(date_to).timestamp())
-
-            filtered = (
-                d for d in deals
-                if date_from_ts <= d.time <= date_to_ts
-            ) # obtain orders that fall within this time range
-
-            # optional group filter
-            if group is not None:
-                filtered = (
-                    d for d in filtered
-                    if fnmatch.fnmatch(d.symbol, group)
-                )
-
-            return tuple(filtered)
+            return self.__history_deals_get_tester(date_from, date_to, group, ticket, position)
     
         try: # we are not on the strategy tester simulation
             
@@ -1048,21 +1279,121 @@ class StrategyTester:
             self.logger.error(f"MetaTrader5 error = {e}")
             return None
     
+    def __add_order(self, order: TradeOrder):
+        
+        self.__orders_container__[order.ticket] = order
+        self.__orders_by_symbol__[order.symbol][order.ticket] = order
+        self.__orders_book.add(order, self.__symbol_id(order.symbol))
+        self.__sum_volume_orders__ += order.volume_current
+    
+    def __history_deals_get_tester(self,
+                                   date_from: datetime,
+                                   date_to: datetime,
+                                   group: Optional[str] = None,
+                                   ticket: Optional[int] = None,
+                                   position: Optional[int] = None
+                                   ) -> tuple:
+        
+        """history_deals_get on the simulated history, bound in place of the public method in tester mode"""
+        
+        deals = self.__deals_history_container__
+
+        # ticket filter (highest priority)
+        if ticket is not None:
+            deal = deals.get(ticket)
+            return (deal,) if deal is not None else tuple()
+
+        # position filter
+        if position is not None:
+            return tuple(deals.by_position.get(position, ()))
+
+        # date range is a requirement  
+        if date_from is None or date_to is None:
+            self.logger.error("date_from and date_to must be specified")
+            return None
+
+        date_from_ts = _dt_to_ts(date_from)
+        date_to_ts   = _dt_to_ts(date_to)
+
+        # optional group filter, only the symbols matching it are visited
+        symbols = None
+        if group is not None:
+            symbols = [sym for sym in deals.by_symbol if _glob_match(group, sym)]
+
+        filtered = deals.between(date_from_ts, date_to_ts, symbols) # obtain deals that fall within this time range
+
+        return tuple(filtered)
+    
+    def __remove_order(self, order: TradeOrder):
+        
+        del self.__orders_container__[order.ticket]
+        del self.__orders_by_symbol__[order.symbol][order.ticket]
+        self.__orders_book.remove(order.ticket)
+        self.__sum_volume_orders__ = self.__sum_volume_orders__ - order.volume_current if self.__orders_container__ else 0.0 # reset when empty so that rounding errors don't pile up
+    
+    def __replace_order(self, order: TradeOrder):
+        
+        """Swaps an updated copy of an active order into the containers holding it, records are immutable"""
+        
+        self.__orders_container__[order.ticket] = order
+        self.__orders_by_symbol__[order.symbol][order.ticket] = order
+        self.__orders_book.replace(order)
+    
+    def __drop_orders(self, keep: np.ndarray):
+        
+        """Removes many orders at once, those whose entry in the boolean mask keep (row aligned with the orders book) is False"""
+        
+        book = self.__orders_book
+        
+        for order, k in zip(book.objects, keep.tolist()):
+            if k:
+                continue
+            
+            del self.__orders_container__[order.ticket]
+            del self.__orders_by_symbol__[order.symbol][order.ticket]
+            self.__sum_volume_orders__ -= order.volume_current
+        
+        book.compact(keep)
+        
+        if not self.__orders_container__:
+            self.__sum_volume_orders__ = 0.0
+    
+    def __add_position(self, position: TradePosition):
+        
+        self.__positions_container__[position.ticket] = position
+        self.__positions_by_symbol__[position.symbol][position.ticket] = position
+        self.__positions_by_key[(position.symbol, position.magic, position.type)][position.ticket] = position
+        self.__positions_book.add(position, self.__symbol_id(position.symbol))
+        self.__sum_volume_positions__ += position.volume
+    
+    def __replace_position(self, position: TradePosition):
+        
+        """Swaps an updated copy of an open position into the containers holding it, records are immutable"""
+        
+        self.__positions_container__[position.ticket] = position
+        self.__positions_by_symbol__[position.symbol][position.ticket] = position
+        self.__positions_by_key[(position.symbol, position.magic, position.type)][position.ticket] = position
+        self.__positions_book.replace(position)
+    
+    def __remove_position(self, position: TradePosition):
+        
+        del self.__positions_container__[position.ticket]
+        del self.__positions_by_symbol__[position.symbol][position.ticket]
+        del self.__positions_by_key[(position.symbol, position.magic, position.type)][position.ticket]
+        self.__positions_book.remove(position.ticket)
+        self.__sum_volume_positions__ = self.__sum_volume_positions__ - position.volume if self.__positions_container__ else 0.0
+    
     def __generate_deal_ticket(self) -> int:
         return len(self.__deals_history_container__)+1
     
     def __generate_order_ticket(self) -> int:
-        ts = int(time.time_ns())
-        rand = secrets.randbits(6)
-        return (ts << 6) | rand
+        return next(self.__tickets)
 
     def __generate_order_history_ticket(self) -> int:
         return len(self.__orders_history_container__)+1
     
     def __generate_position_ticket(self) -> int:
-        ts = int(time.time_ns())
-        rand = secrets.randbits(6)
-        return (ts << 6) | rand
+        return next(self.__tickets)
 
     def __calc_commission(self) -> float:
         """
@@ -1086,9 +1417,9 @@ class StrategyTester:
             time_expiration=0,
 
             type=position.type,
-            type_time=self.mt5_instance.ORDER_TIME_GTC,
-            type_filling=self.mt5_instance.ORDER_FILLING_FOK,
-            state=self.mt5_instance.ORDER_STATE_FILLED,
+            type_time=ORDER_TIME_GTC,
+            type_filling=ORDER_FILLING_FOK,
+            state=ORDER_STATE_FILLED,
 
             magic=position.magic,
             position_id=position.ticket,
@@ -1118,209 +1449,165 @@ class StrategyTester:
         
         if not self.IS_TESTER:
             result = self.mt5_instance.order_send(request)
-            if result is None or result.retcode != self.mt5_instance.TRADE_RETCODE_DONE:
+            if result is None or result.retcode != TRADE_RETCODE_DONE:
                 self.logger.warning(f"MT5 failed: {error_description.trade_server_return_code_description(self.mt5_instance.last_error()[0])}")
                 return None
             return result
         
-        # -------------------- Extract request -----------------------------
+        handler = self.__order_send_handlers.get(request.get("action"))
+        if handler is None:
+            return {
+                "retcode": TRADE_RETCODE_INVALID,
+                "comment": "Unsupported trade action",
+            }
         
-        action     = request.get("action")
-        order_type = request.get("type", None)
-        symbol     = request.get("symbol")
-        volume     = float(request.get("volume", 0))
-        price      = float(request.get("price", 0))
-        sl         = float(request.get("sl", 0))
-        tp         = float(request.get("tp", 0))
-        ticket     = int(request.get("ticket", -1))
+        return handler(request)
+    
+    def orders_delete(self, tickets: list[int]) -> int:
         
-        # try:
+        """Removes many pending orders at once, in the tester the orders book is compacted a single time instead of once per order.
+
+        Args:
+            tickets (list[int]): Tickets of the pending orders to remove, unknown tickets are skipped.
+
+        Returns:
+            int: Number of orders removed.
+        """
         
-        ticks_info = self.symbol_info_tick(symbol)
-        symbol_info = self.symbol_info(symbol)
-        ac_info = self.account_info()
+        if not self.IS_TESTER:
+            removed = 0
+            for ticket in tickets:
+                if self.order_send({"action": TRADE_ACTION_REMOVE, "order": ticket}) is not None:
+                    removed += 1
+            
+            return removed
         
-        # except Exception as e:
-        #     self.logger.critical(f"Failed to obtain necessary ticks, symbol, or account info: {e}")
-        #     return None
+        book = self.__orders_book
+        keep = np.ones(len(book), dtype=bool)
         
-        now = ticks_info.time
-        ts  = int(now)
-        msc = int(now * 1000)
+        for ticket in tickets:
+            row = book.rows.get(ticket)
+            if row is not None:
+                keep[row] = False
+        
+        removed = len(book) - int(np.count_nonzero(keep))
+        if removed == 0:
+            return 0
+        
+        for order, k in zip(book.objects, keep.tolist()):
+            if not k:
+                self.__log_info(f"Pending order: {order.ticket} removed!")
+        
+        self.__drop_orders(keep)
+        return removed
+    
+    # ------------------ order_send handlers, one per trade action -----------------------
+    
+    def __is_valid_order_type(self, order_type: Optional[int]) -> bool:
         
+        if order_type is not None and order_type not in self.ORDER_TYPES:
+            self.logger.critical("Invalid order type")
+            return False
         
-        if order_type is not None:
-            if order_type not in self.ORDER_TYPES:
-                self.logger.critical("Invalid order type")
-                return None 
+        return True
     
-        trade_validators = TradeValidators(symbol_info=symbol_info, 
+    def __trade_validators(self, symbol: str, symbol_info: namedtuple, ticks_info: Tick) -> TradeValidators:
+        
+        """One TradeValidators object per symbol, reused across requests and pointed at the latest symbol info and tick"""
+        
+        validators = self.__validators_by_symbol.get(symbol)
+        if validators is None:
+            validators = TradeValidators(symbol_info=symbol_info, 
                                         ticks_info=ticks_info, 
                                         logger=self.logger, 
                                         mt5_instance=self.mt5_instance)
-
-        # ------------------ MARKET DEAL (open or close) ------------------
-        
-        if action == self.mt5_instance.TRADE_ACTION_DEAL:
-            
-            def deal_reason_gen() -> int:
-                eps = pow(10, -symbol_info.digits)
-                if TradeValidators.price_equal(a=price, b=sl, eps=eps):
-                    return self.mt5_instance.DEAL_REASON_SL
-                
-                if TradeValidators.price_equal(a=price, b=tp, eps=eps):
-                    return self.mt5_instance.DEAL_REASON_TP
-                
-                return self.mt5_instance.DEAL_REASON_EXPERT
-                
-            # ---------- CLOSE POSITION ----------
             
-            ticket = request.get("position", -1)
-            if ticket != -1:
-                pos = next(
-                    (p for p in self.__positions_container__ if p.ticket == ticket),
-                    None,
-                )
-                
-                if not pos:
-                    return {"retcode": self.mt5_instance.TRADE_RETCODE_INVALID}
+            self.__validators_by_symbol[symbol] = validators
+        else:
+            validators.symbol_info = symbol_info
+            validators.ticks_info = ticks_info
+        
+        return validators
+    
+    def __order_send_deal(self, request: dict):
+        
+        """Opens a position at the market or closes an existing one (when request['position'] is given)"""
+        
+        order_type = request.get("type", None)
+        if not self.__is_valid_order_type(order_type):
+            return None
+        
+        symbol = request.get("symbol")
+        
+        ticks_info = self.symbol_info_tick(symbol)
+        symbol_info = self.symbol_info(symbol)
+        
+        now = ticks_info.time
+        ts  = int(now)
+        msc = int(now * 1000)
+        
+        volume = float(request.get("volume", 0))
+        price  = float(request.get("price", 0))
+        sl     = float(request.get("sl", 0))
+        tp     = float(request.get("tp", 0))
+        
+        eps = self.__eps_by_symbol[symbol]
 
-                # validate position close request
-                
-                if pos.type == order_type:
-                    self.logger.critical("Failed to close an order. Order type must be the opposite")
-                    return None
-                
-                if order_type == self.mt5_instance.ORDER_TYPE_BUY: # For a sell order/position
-                    
-                    if not TradeValidators.price_equal(a=price, b=ticks_info.ask, eps=pow(10, -symbol_info.digits)):
-                        self.logger.critical(f"Failed to close ORDER_TYPE_SELL. Price {price} is not equal to bid {ticks_info.bid}")
-                        return None
-                        
-                elif order_type == self.mt5_instance.ORDER_TYPE_SELL: # For a buy order/position
-                    if not TradeValidators.price_equal(a=price, b=ticks_info.bid, eps=pow(10, -symbol_info.digits)):
-                        self.logger.critical(f"Failed to close ORDER_TYPE_BUY. Price {price} is not equal to bid {ticks_info.bid}")
-                        return None
-                
-                # update the account balance    
-                
-                self.AccountInfo = self.AccountInfo._replace(
-                    balance=self.AccountInfo.balance + pos.profit
-                )
-                
-                self.__positions_container__.remove(pos) 
-                
-                # self.__orders_history_container__.append(
-                #     self.__position_to_order(position=position) #TODO:
-                # )
-                
-                deal_ticket = self.__generate_deal_ticket()
-                self.__deals_history_container__.append(
-                    TradeDeal(
-                        ticket=deal_ticket,
-                        order=0,
-                        time=ts,
-                        time_msc=msc,
-                        type=order_type,
-                        entry=self.mt5_instance.DEAL_ENTRY_OUT,
-                        magic=request.get("magic", 0),
-                        position_id=pos.ticket,
-                        reason=deal_reason_gen(),
-                        volume=volume,
-                        price=price,
-                        commission=self.__calc_commission(),
-                        swap=0,
-                        profit=pos.profit,
-                        fee=0,
-                        symbol=symbol,
-                        comment=request.get("comment", ""),
-                        external_id="",
-                        balance=self.AccountInfo.balance,
-                    )
-                )
+        # ---------- CLOSE POSITION ----------
 
-                self.logger.info(f"Position: {ticket} closed!")
-                
-                return {
-                    "retcode": self.mt5_instance.TRADE_RETCODE_DONE,
-                    "deal": deal_ticket,
-                }
-                
-            # ---------- OPEN POSITION ----------
-            
-            # validate new stops 
-            
-            if not trade_validators.is_valid_sl(entry=price, sl=sl, order_type=order_type):
-                return None
-            if not trade_validators.is_valid_tp(entry=price, tp=tp, order_type=order_type):
-                return None
-            
-            # validate the lotsize
-            
-            if not trade_validators.is_valid_lotsize(lotsize=volume):
-                return None
-            
-            total_volume = sum([pos.volume for pos in self.__positions_container__]) + sum([order.volume_current for order in self.__orders_container__])
-            if trade_validators.is_symbol_volume_reached(symbol_volume=total_volume, volume_limit=symbol_info.volume_limit):
-                return None
-            
-            
-            if not trade_validators.is_there_enough_money(margin_required=self.order_calc_margin(
-                                                        order_type=order_type, 
-                                                        symbol=symbol,
-                                                        volume=volume,
-                                                        price=price), 
-                                                        free_margin=ac_info.margin_free):
+        ticket = request.get("position", -1)
+        if ticket != -1:
+            self.__sync_positions() # the record's profit is booked into the balance
+            pos = self.__positions_container__.get(ticket)
+
+            if not pos:
+                return {"retcode": TRADE_RETCODE_INVALID}
+
+            # validate position close request
+
+            if pos.type == order_type:
+                self.logger.critical("Failed to close an order. Order type must be the opposite")
                 return None
-            
-            position_ticket = self.__generate_position_ticket()
-            order_ticket    = self.__generate_order_ticket()
-            deal_ticket     = self.__generate_deal_ticket()
 
-            position = TradePosition(
-                ticket=position_ticket,
-                time=ts,
-                time_msc=msc,
-                time_update=ts,
-                time_update_msc=msc,
-                type=order_type,
-                magic=request.get("magic", 0),
-                identifier=position_ticket,
-                reason=self.mt5_instance.DEAL_REASON_EXPERT,
-                volume=volume,
-                price_open=price,
-                sl=sl,
-                tp=tp,
-                price_current=price,
-                swap=0,
-                profit=0,
-                symbol=symbol,
-                comment=request.get("comment", ""),
-                external_id="",
-            )
-            
-            self.__positions_container__.append(position)
+            if order_type == ORDER_TYPE_BUY: # For a sell order/position
 
-            self.__orders_history_container__.append(
-                self.__position_to_order(position=position, ticket=self.__generate_order_history_ticket())
-            )
-            
+                if not TradeValidators.price_equal(a=price, b=ticks_info.ask, eps=eps):
+                    self.logger.critical(f"Failed to close ORDER_TYPE_SELL. Price {price} is not equal to bid {ticks_info.bid}")
+                    return None
+
+            elif order_type == ORDER_TYPE_SELL: # For a buy order/position
+                if not TradeValidators.price_equal(a=price, b=ticks_info.bid, eps=eps):
+                    self.logger.critical(f"Failed to close ORDER_TYPE_BUY. Price {price} is not equal to bid {ticks_info.bid}")
+                    return None
+
+            # update the account balance    
+
+            self.AccountInfo.balance += pos.profit
+            self.__account_snapshot = None
+
+            self.__remove_position(pos)
+
+            # self.__orders_history_container__.append(
+            #     self.__position_to_order(position=position) #TODO:
+            # )
+
+            deal_ticket = self.__generate_deal_ticket()
             self.__deals_history_container__.append(
                 TradeDeal(
                     ticket=deal_ticket,
-                    order=order_ticket,
+                    order=0,
                     time=ts,
                     time_msc=msc,
                     type=order_type,
-                    entry=self.mt5_instance.DEAL_ENTRY_IN,
+                    entry=DEAL_ENTRY_OUT,
                     magic=request.get("magic", 0),
-                    position_id=position_ticket,
-                    reason=deal_reason_gen(),
+                    position_id=pos.ticket,
+                    reason=_deal_reason(price, sl, tp, eps),
                     volume=volume,
                     price=price,
                     commission=self.__calc_commission(),
                     swap=0,
-                    profit=0,
+                    profit=pos.profit,
                     fee=0,
                     symbol=symbol,
                     comment=request.get("comment", ""),
@@ -1328,174 +1615,342 @@ class StrategyTester:
                     balance=self.AccountInfo.balance,
                 )
             )
-            
-            
-            self.logger.info(f"Position: {position_ticket} opened!")
-                
+
+            self.__log_info(f"Position: {ticket} closed!")
+
             return {
-                "retcode": self.mt5_instance.TRADE_RETCODE_DONE,
+                "retcode": TRADE_RETCODE_DONE,
                 "deal": deal_ticket,
-                "order": order_ticket,
-                "position": position_ticket,
             }
-            
-        # --------------------- PENDING order --------------------------
+
+        # ---------- OPEN POSITION ----------
+
+        trade_validators = self.__trade_validators(symbol, symbol_info, ticks_info) # closing a position doesn't need them
+        ac_info = self.AccountInfo
         
-        elif action == self.mt5_instance.TRADE_ACTION_PENDING:
-            
-            if trade_validators.is_max_orders_reached(open_orders=len(self.__orders_container__), 
-                                                      ac_limit_orders=ac_info.limit_orders):
-                return None
-            
-            if not trade_validators.is_valid_sl(entry=price, sl=sl, order_type=order_type) or not trade_validators.is_valid_tp(entry=price, tp=tp, order_type=order_type):
-                return None
-            
-            total_volume = sum([pos.volume for pos in self.__positions_container__]) + sum([order.volume_current for order in self.__orders_container__])
-            if trade_validators.is_symbol_volume_reached(symbol_volume=total_volume, volume_limit=symbol_info.volume_limit):
-                return None
-            
-            order_ticket = self.__generate_order_ticket()
+        # validate new stops 
 
-            order = TradeOrder(
-                    ticket=order_ticket,
-                    time_setup=ts,
-                    time_setup_msc=msc,
-                    time_done=0,
-                    time_done_msc=0,
-                    time_expiration=request.get("expiration", 0),
-                    type=order_type,
-                    type_time=request.get("type_time", 0),
-                    type_filling=request.get("type_filling", 0),
-                    state=self.mt5_instance.ORDER_STATE_PLACED,
-                    magic=request.get("magic", 0),
-                    position_id=0,
-                    position_by_id=0,
-                    reason=self.mt5_instance.DEAL_REASON_EXPERT,
-                    volume_initial=volume,
-                    volume_current=volume,
-                    price_open=price,
-                    sl=sl,
-                    tp=tp,
-                    price_current=price,
-                    price_stoplimit=request.get("price_stoplimit", 0),
-                    symbol=symbol,
-                    comment=request.get("comment", ""),
-                    external_id="",
-                )
-                
-            self.__orders_container__.append(order) 
-            self.__orders_history_container__.append(order)
-            
-            self.logger.info(f"Pending order: {order_ticket} placed!")
-                
-            return {
-                "retcode": self.mt5_instance.TRADE_RETCODE_DONE,
-                "order": order_ticket,
-            }
-            
-        elif action == self.mt5_instance.TRADE_ACTION_SLTP:
-            
-            ticket = request.get("position", -1)
+        if not trade_validators.is_valid_sl(entry=price, sl=sl, order_type=order_type):
+            return None
+        if not trade_validators.is_valid_tp(entry=price, tp=tp, order_type=order_type):
+            return None
 
-            pos = next((p for p in self.__positions_container__ if p.ticket == ticket), None)
-            if not pos:
-                return {"retcode": self.mt5_instance.TRADE_RETCODE_INVALID}
+        # validate the lotsize
 
-            # --- Correct reference prices ---
-            entry_price = pos.price_open
-            market_price = ticks_info.bid if pos.type == self.mt5_instance.POSITION_TYPE_BUY else ticks_info.ask
+        if not trade_validators.is_valid_lotsize(lotsize=volume):
+            return None
 
-            # --- Validate SL / TP relative to ENTRY ---
-            if sl > 0:
-                if not trade_validators.is_valid_sl(entry=entry_price, sl=sl, order_type=pos.type):
-                    return None
+        total_volume = self.__sum_volume_positions__ + self.__sum_volume_orders__
+        if trade_validators.is_symbol_volume_reached(symbol_volume=total_volume, volume_limit=symbol_info.volume_limit):
+            return None
 
-            if tp > 0:
-                if not trade_validators.is_valid_tp(entry=entry_price, tp=tp, order_type=pos.type):
-                    return None
 
-            # --- Validate freeze level against MARKET ---
-            if sl > 0:
-                if not trade_validators.is_valid_freeze_level(entry=market_price, stop_price=sl, order_type=pos.type):
-                    return None
+        if not trade_validators.is_there_enough_money(margin_required=self.order_calc_margin(
+                                                    order_type=order_type, 
+                                                    symbol=symbol,
+                                                    volume=volume,
+                                                    price=price), 
+                                                    free_margin=ac_info.margin_free):
+            return None
 
-            if tp > 0:
-                if not trade_validators.is_valid_freeze_level(entry=market_price, stop_price=tp, order_type=pos.type):
-                    return None
+        position_ticket = self.__generate_position_ticket()
+        order_ticket    = self.__generate_order_ticket()
+        deal_ticket     = self.__generate_deal_ticket()
+
+        position = TradePosition(
+            ticket=position_ticket,
+            time=ts,
+            time_msc=msc,
+            time_update=ts,
+            time_update_msc=msc,
+            type=order_type,
+            magic=request.get("magic", 0),
+            identifier=position_ticket,
+            reason=DEAL_REASON_EXPERT,
+            volume=volume,
+            price_open=price,
+            sl=sl,
+            tp=tp,
+            price_current=price,
+            swap=0,
+            profit=0,
+            symbol=symbol,
+            comment=request.get("comment", ""),
+            external_id="",
+        )
 
-            # --- APPLY MODIFICATION ---
-            idx = self.__positions_container__.index(pos)
+        self.__add_position(position)
 
-            updated_pos = pos._replace(
-                sl=sl,
-                tp=tp,
-                time_update=ts,
-                time_update_msc=msc
+        self.__orders_history_container__.append(
+            self.__position_to_order(position=position, ticket=self.__generate_order_history_ticket())
+        )
+
+        self.__deals_history_container__.append(
+            TradeDeal(
+                ticket=deal_ticket,
+                order=order_ticket,
+                time=ts,
+                time_msc=msc,
+                type=order_type,
+                entry=DEAL_ENTRY_IN,
+                magic=request.get("magic", 0),
+                position_id=position_ticket,
+                reason=_deal_reason(price, sl, tp, eps),
+                volume=volume,
+                price=price,
+                commission=self.__calc_commission(),
+                swap=0,
+                profit=0,
+                fee=0,
+                symbol=symbol,
+                comment=request.get("comment", ""),
+                external_id="",
+                balance=self.AccountInfo.balance,
             )
+        )
 
-            self.__positions_container__[idx] = updated_pos
 
-            self.logger.info(f"Position: {ticket} Modified!")
-                
-            return {"retcode": self.mt5_instance.TRADE_RETCODE_DONE}
+        self.__log_info(f"Position: {position_ticket} opened!")
+
+        return {
+            "retcode": TRADE_RETCODE_DONE,
+            "deal": deal_ticket,
+            "order": order_ticket,
+            "position": position_ticket,
+        }
+    
+    def __order_send_pending(self, request: dict):
         
-            
-        # -------------------- REMOVE pending order ------------------------
+        """Places a pending order"""
         
-        elif action == self.mt5_instance.TRADE_ACTION_MODIFY: # Modifying pending orders
-
-            ticket = request.get("order", -1)
+        order_type = request.get("type", None)
+        if not self.__is_valid_order_type(order_type):
+            return None
+        
+        symbol = request.get("symbol")
+        
+        ticks_info = self.symbol_info_tick(symbol)
+        symbol_info = self.symbol_info(symbol)
+        
+        now = ticks_info.time
+        ts  = int(now)
+        msc = int(now * 1000)
+        
+        volume = float(request.get("volume", 0))
+        price  = float(request.get("price", 0))
+        sl     = float(request.get("sl", 0))
+        tp     = float(request.get("tp", 0))
+        
+        ac_info = self.AccountInfo
+        
+        trade_validators = self.__trade_validators(symbol, symbol_info, ticks_info)
+        
+        if trade_validators.is_max_orders_reached(open_orders=len(self.__orders_container__), 
+                                                  ac_limit_orders=ac_info.limit_orders):
+            return None
 
-            order = next(
-                (o for o in self.__orders_container__ if o.ticket == ticket),
-                None,
-            )
+        if not trade_validators.is_valid_sl(entry=price, sl=sl, order_type=order_type) or not trade_validators.is_valid_tp(entry=price, tp=tp, order_type=order_type):
+            return None
 
-            if not order:
-                return {"retcode": self.mt5_instance.TRADE_RETCODE_INVALID}
+        total_volume = self.__sum_volume_positions__ + self.__sum_volume_orders__
+        if trade_validators.is_symbol_volume_reached(symbol_volume=total_volume, volume_limit=symbol_info.volume_limit):
+            return None
 
-            # validate new stops 
-            
-            if not trade_validators.is_valid_freeze_level(entry=price, stop_price=sl, order_type=order_type):
-                return None
-            if not trade_validators.is_valid_freeze_level(entry=price, stop_price=tp, order_type=order_type):
-                return None
-                
-            # Modify ONLY allowed fields
-            
-            idx = self.__orders_container__.index(order)
+        order_ticket = self.__generate_order_ticket()
 
-            updated_order = order._replace(
+        order = TradeOrder(
+                ticket=order_ticket,
+                time_setup=ts,
+                time_setup_msc=msc,
+                time_done=0,
+                time_done_msc=0,
+                time_expiration=_expiration_ts(request.get("expiration", 0)),
+                type=order_type,
+                type_time=request.get("type_time", 0),
+                type_filling=request.get("type_filling", 0),
+                state=ORDER_STATE_PLACED,
+                magic=request.get("magic", 0),
+                position_id=0,
+                position_by_id=0,
+                reason=DEAL_REASON_EXPERT,
+                volume_initial=volume,
+                volume_current=volume,
                 price_open=price,
                 sl=sl,
                 tp=tp,
-                time_expiration = request.get("expiration", order.time_expiration),
-                price_stoplimit = request.get("price_stoplimit", order.price_stoplimit)
+                price_current=price,
+                price_stoplimit=request.get("price_stoplimit", 0),
+                symbol=symbol,
+                comment=request.get("comment", ""),
+                external_id="",
             )
 
-            self.__orders_container__[idx] = updated_order
-            
-            self.logger.info(f"Pending Order: {ticket} Modified!")
-                
-            return {"retcode": self.mt5_instance.TRADE_RETCODE_DONE}
-        
-        elif action == self.mt5_instance.TRADE_ACTION_REMOVE:
-            
-            ticket = request.get("order", -1)
-            
-            self.__orders_container__ = [
-                o for o in self.__orders_container__ if o.ticket != ticket
-            ]
-            
-            self.logger.info(f"Pending order: {ticket} removed!")
-                
-            return {"retcode": self.mt5_instance.TRADE_RETCODE_DONE}
+        self.__add_order(order)
+        self.__orders_history_container__.append(order)
+
+        self.__log_info(f"Pending order: {order_ticket} placed!")
 
         return {
-            "retcode": self.mt5_instance.TRADE_RETCODE_INVALID,
-            "comment": "Unsupported trade action",
+            "retcode": TRADE_RETCODE_DONE,
+            "order": order_ticket,
         }
     
+    def __order_send_sltp(self, request: dict):
+        
+        """Modifies the stop loss and take profit of an open position"""
+        
+        if not self.__is_valid_order_type(request.get("type", None)):
+            return None
+        
+        symbol = request.get("symbol")
+        
+        ticks_info = self.symbol_info_tick(symbol)
+        symbol_info = self.symbol_info(symbol)
+        
+        now = ticks_info.time
+        ts  = int(now)
+        msc = int(now * 1000)
+        
+        sl = float(request.get("sl", 0))
+        tp = float(request.get("tp", 0))
+        
+        trade_validators = self.__trade_validators(symbol, symbol_info, ticks_info)
+        
+        ticket = request.get("position", -1)
+
+        pos = self.__positions_container__.get(ticket)
+        if not pos:
+            return {"retcode": TRADE_RETCODE_INVALID}
+
+        # --- Correct reference prices ---
+        entry_price = pos.price_open
+        market_price = ticks_info.bid if pos.type == POSITION_TYPE_BUY else ticks_info.ask
+
+        # --- Validate SL / TP relative to ENTRY ---
+        if sl > 0:
+            if not trade_validators.is_valid_sl(entry=entry_price, sl=sl, order_type=pos.type):
+                return None
+
+        if tp > 0:
+            if not trade_validators.is_valid_tp(entry=entry_price, tp=tp, order_type=pos.type):
+                return None
+
+        # --- Validate freeze level against MARKET ---
+        if sl > 0:
+            if not trade_validators.is_valid_freeze_level(entry=market_price, stop_price=sl, order_type=pos.type):
+                return None
+
+        if tp > 0:
+            if not trade_validators.is_valid_freeze_level(entry=market_price, stop_price=tp, order_type=pos.type):
+                return None
+
+        # --- APPLY MODIFICATION ---
+        self.__replace_position(pos._replace(sl=sl, tp=tp, time_update=ts, time_update_msc=msc))
+        self.__positions_book.set(ticket, "sl", sl)
+        self.__positions_book.set(ticket, "tp", tp)
+        self.__positions_book.set(ticket, "time_update", ts)
+        self.__positions_book.set(ticket, "time_update_msc", msc)
+
+        self.__log_info(f"Position: {ticket} Modified!")
+
+        return {"retcode": TRADE_RETCODE_DONE}
+    
+    def __order_send_modify(self, request: dict):
+        
+        """Modifies a pending order"""
+        
+        order_type = request.get("type", None)
+        if not self.__is_valid_order_type(order_type):
+            return None
+        
+        symbol = request.get("symbol")
+        
+        price = float(request.get("price", 0))
+        sl    = float(request.get("sl", 0))
+        tp    = float(request.get("tp", 0))
+        
+        ticks_info = self.symbol_info_tick(symbol)
+        symbol_info = self.symbol_info(symbol)
+        
+        trade_validators = self.__trade_validators(symbol, symbol_info, ticks_info)
+        
+        ticket = request.get("order", -1)
+
+        order = self.__orders_container__.get(ticket)
+
+        if not order:
+            return {"retcode": TRADE_RETCODE_INVALID}
+
+        # validate new stops 
+
+        if not trade_validators.is_valid_freeze_level(entry=price, stop_price=sl, order_type=order_type):
+            return None
+        if not trade_validators.is_valid_freeze_level(entry=price, stop_price=tp, order_type=order_type):
+            return None
+
+        # Modify ONLY allowed fields
+
+        order = order._replace(
+            price_open=price,
+            sl=sl,
+            tp=tp,
+            time_expiration=_expiration_ts(request.get("expiration", order.time_expiration)),
+            price_stoplimit=request.get("price_stoplimit", order.price_stoplimit)
+        )
+        
+        self.__replace_order(order)
+        
+        book = self.__orders_book
+        book.set(ticket, "price_open", price)
+        book.set(ticket, "time_expiration", order.time_expiration)
+        book.set(ticket, "price_stoplimit", order.price_stoplimit)
+
+        self.__log_info(f"Pending Order: {ticket} Modified!")
+
+        return {"retcode": TRADE_RETCODE_DONE}
+    
+    def __order_send_remove(self, request: dict):
+        
+        """Removes a pending order"""
+        
+        if not self.__is_valid_order_type(request.get("type", None)):
+            return None
+        
+        ticket = request.get("order", -1)
+
+        order = self.__orders_container__.get(ticket)
+        if order is not None:
+            self.__remove_order(order)
+
+        self.__log_info(f"Pending order: {ticket} removed!")
+
+        return {"retcode": TRADE_RETCODE_DONE}
+    
+    # ------------------ profit formulas per trade calc mode -----------------------
+    
+    def __profit_by_contract(self, sym, order_type, direction, volume, price_open, price_close) -> float: # FOREX / CFD / STOCKS
+        return (price_close - price_open) * direction * sym.trade_contract_size * volume
+    
+    def __profit_by_ticks(self, sym, order_type, direction, volume, price_open, price_close) -> float: # FUTURES
+        
+        if sym.trade_tick_size <= 0:
+            self.logger.critical("Invalid tick size")
+            return 0.0
+        
+        _, tick_value_per_price, _, _ = self.__get_profit_params(sym.name) # tick value / tick size, computed once per symbol
+        return (price_close - price_open) * direction * volume * tick_value_per_price
+    
+    def __profit_bonds(self, sym, order_type, direction, volume, price_open, price_close) -> float:
+        
+        return volume * sym.trade_contract_size * (sym.trade_face_value * (price_close - price_open) + sym.trade_accrued_interest)
+    
+    def __profit_collateral(self, sym, order_type, direction, volume, price_open, price_close) -> float:
+        
+        tick = self.tick_cache[sym.name]
+        market_price = tick.ask if order_type == ORDER_TYPE_BUY else tick.bid
+        
+        return volume * sym.trade_contract_size * market_price * sym.trade_liquidity_rate
+    
     def order_calc_profit(self, 
                         order_type: int,
                         symbol: str,
@@ -1517,101 +1972,22 @@ class StrategyTester:
         
         if self.IS_TESTER:
             
-            contract_size = sym.trade_contract_size
-            
-            BUY_ACTIONS = {
-                self.mt5_instance.ORDER_TYPE_BUY,
-                self.mt5_instance.ORDER_TYPE_BUY_LIMIT,
-                self.mt5_instance.ORDER_TYPE_BUY_STOP,
-                self.mt5_instance.ORDER_TYPE_BUY_STOP_LIMIT,
-            }
-
-            SELL_ACTIONS = {
-                self.mt5_instance.ORDER_TYPE_SELL,
-                self.mt5_instance.ORDER_TYPE_SELL_LIMIT,
-                self.mt5_instance.ORDER_TYPE_SELL_STOP,
-                self.mt5_instance.ORDER_TYPE_SELL_STOP_LIMIT,
-            }
+            direction = ORDER_DIRECTIONS.get(order_type)
+            if direction is None:
+                self.logger.critical(f"Unsupported order type: {order_type}")
+                return 0.0
             
-            # --- Determine direction ---
-            if order_type in BUY_ACTIONS: #TODO: 
-                direction = 1
-            elif order_type in SELL_ACTIONS:
-                direction = -1
-
-            # --- Core profit calculation ---
-
             calc_mode = sym.trade_calc_mode
-            price_delta = (price_close - price_open) * direction
-
+            calculator = self.__profit_calculators.get(calc_mode)
+            
+            if calculator is None:
+                self.logger.critical(
+                    f"Unsupported trade calc mode: {calc_mode}"
+                )
+                return 0.0
+            
             try:
-                # ------------------ FOREX / CFD / STOCKS -----------------------
-                if calc_mode in (
-                    self.mt5_instance.SYMBOL_CALC_MODE_FOREX,
-                    self.mt5_instance.SYMBOL_CALC_MODE_FOREX_NO_LEVERAGE,
-                    self.mt5_instance.SYMBOL_CALC_MODE_CFD,
-                    self.mt5_instance.SYMBOL_CALC_MODE_CFDINDEX,
-                    self.mt5_instance.SYMBOL_CALC_MODE_CFDLEVERAGE,
-                    self.mt5_instance.SYMBOL_CALC_MODE_EXCH_STOCKS,
-                    self.mt5_instance.SYMBOL_CALC_MODE_EXCH_STOCKS_MOEX,
-                ):
-                    profit = price_delta * contract_size * volume
-
-                # ---------------- FUTURES --------------------
-                elif calc_mode in (
-                    self.mt5_instance.SYMBOL_CALC_MODE_FUTURES,
-                    self.mt5_instance.SYMBOL_CALC_MODE_EXCH_FUTURES,
-                    # self.mt5_instance.SYMBOL_CALC_MODE_EXCH_FUTURES_FORTS,
-                ):
-                    tick_value = sym.trade_tick_value
-                    tick_size = sym.trade_tick_size
-
-                    if tick_size <= 0:
-                        self.logger.critical("Invalid tick size")
-                        return 0.0
-
-                    profit = price_delta * volume * (tick_value / tick_size)
-
-                # ---------- BONDS -------------------
-                
-                elif calc_mode in (
-                    self.mt5_instance.SYMBOL_CALC_MODE_EXCH_BONDS,
-                    self.mt5_instance.SYMBOL_CALC_MODE_EXCH_BONDS_MOEX,
-                ):
-                    face_value = sym.trade_face_value
-                    accrued_interest = sym.trade_accrued_interest
-
-                    profit = (
-                        volume
-                        * contract_size
-                        * (price_close * face_value + accrued_interest)
-                        - volume
-                        * contract_size
-                        * (price_open * face_value)
-                    )
-
-                # ------ COLLATERAL -------
-                elif calc_mode == self.mt5_instance.SYMBOL_CALC_MODE_SERV_COLLATERAL:
-                    liquidity_rate = sym.trade_liquidity_rate
-                    market_price = (
-                        self.tick_cache[symbol].ask if order_type == self.mt5_instance.ORDER_TYPE_BUY else self.tick_cache[symbol].bid
-                    )
-
-                    profit = (
-                        volume
-                        * contract_size
-                        * market_price
-                        * liquidity_rate
-                    )
-
-                else:
-                    self.logger.critical(
-                        f"Unsupported trade calc mode: {calc_mode}"
-                    )
-                    return 0.0
-
-                return round(profit, 2)
-                
+                return round(calculator(sym, order_type, direction, volume, price_open, price_close), 2)
             except Exception as e:
                 self.logger.critical(f"Failed: {e}")
                 return 0.0
@@ -1650,168 +2026,297 @@ class StrategyTester:
                 self.logger.warning(f"Failed: MT5 Error = {self.mt5_instance.last_error()}")
                 return 0.0
 
-        # IS_TESTER = True
-        sym = self.symbol_info(symbol)
-
-        contract_size = sym.trade_contract_size
-        leverage = max(self.account_info().leverage, 1)
-
-        margin_rate = (
-            sym.margin_initial
-            if sym.margin_initial > 0
-            else sym.margin_maintenance
-        )
+        # IS_TESTER = True, the calc mode was resolved into a formula when the symbol got its id
         
-        if margin_rate <= 0: # if margin rate is zero set it to 1
-            margin_rate = 1.0
-
-        mode = sym.trade_calc_mode
-
-        if mode == self.mt5_instance.SYMBOL_CALC_MODE_FOREX:
-            margin = (volume * contract_size * price) / leverage
-
-        elif mode == self.mt5_instance.SYMBOL_CALC_MODE_FOREX_NO_LEVERAGE:
-            margin = volume * contract_size * price
-
-        elif mode in (
-            self.mt5_instance.SYMBOL_CALC_MODE_CFD,
-            self.mt5_instance.SYMBOL_CALC_MODE_CFDINDEX,
-            self.mt5_instance.SYMBOL_CALC_MODE_EXCH_STOCKS,
-            self.mt5_instance.SYMBOL_CALC_MODE_EXCH_STOCKS_MOEX,
-        ):
-            margin = volume * contract_size * price * margin_rate
-
-        elif mode == self.mt5_instance.SYMBOL_CALC_MODE_CFDLEVERAGE:
-            margin = (volume * contract_size * price * margin_rate) / leverage
-
-        elif mode in (
-            self.mt5_instance.SYMBOL_CALC_MODE_FUTURES,
-            self.mt5_instance.SYMBOL_CALC_MODE_EXCH_FUTURES,
-            # self.mt5_instance.SYMBOL_CALC_MODE_EXCH_FUTURES_FORTS,
-        ):
-            margin = volume * sym.margin_initial
-
-        elif mode in (
-            self.mt5_instance.SYMBOL_CALC_MODE_EXCH_BONDS,
-            self.mt5_instance.SYMBOL_CALC_MODE_EXCH_BONDS_MOEX,
-        ):
-            margin = (
-                volume
-                * contract_size
-                * sym.trade_face_value
-                * price
-                / 100
-            )
+        margin_function = self.__margin_functions.get(symbol)
+        if margin_function is None:
+            self.__symbol_id(symbol)
+            margin_function = self.__margin_functions[symbol]
 
-        elif mode == self.mt5_instance.SYMBOL_CALC_MODE_SERV_COLLATERAL:
-            margin = 0.0
-
-        else:
-            self.logger.warning(f"Unknown calc mode {mode}, fallback margin formula used")
-            margin = (volume * contract_size * price) / leverage
-
-        return round(margin, 2)
+        return round(margin_function(volume, price), 2)
 
         
-    def __account_monitoring(self):
+    def __symbol_id(self, symbol: str) -> int:
         
-        unrealized_pl = 0
-        total_margin = 0
+        """Index of a symbol into the per symbol arrays, its static profit and margin parameters are added on the first call"""
         
-        for pos in self.__positions_container__:
-            
-            unrealized_pl += pos.profit
-            total_margin += self.order_calc_margin(order_type=pos.type, 
+        symbol_id = self.__symbol_ids.get(symbol)
+        if symbol_id is not None:
+            return symbol_id
+        
+        sym = self.symbol_info(symbol)
+        
+        leverage = max(self.AccountInfo.leverage, 1)
+        
+        coefficients = _margin_coefficients(sym, leverage)
+        if coefficients is None:
+            self.logger.warning(f"Unknown calc mode {sym.trade_calc_mode}, fallback margin formula used")
+            coefficients = (sym.trade_contract_size / leverage, 0.0)
+        
+        tick = self.tick_cache.get(symbol)
+        self.__sym_bid = np.append(self.__sym_bid, tick.bid if tick is not None else 0.0)
+        self.__sym_ask = np.append(self.__sym_ask, tick.ask if tick is not None else 0.0)
+        self.__sym_time = np.append(self.__sym_time, tick.time if tick is not None else 0)
+        self.__sym_time_msc = np.append(self.__sym_time_msc, tick.time_msc if tick is not None else 0)
+        
+        profit_kind, profit_factor, _, _ = self.__get_profit_params(symbol)
+        
+        statics = np.array([(sym.trade_calc_mode,
+                             sym.digits,
+                             sym.trade_contract_size,
+                             sym.trade_tick_size,
+                             sym.trade_tick_value,
+                             sym.margin_initial,
+                             sym.trade_face_value,
+                             sym.trade_accrued_interest,
+                             profit_kind,
+                             profit_factor,
+                             *coefficients)], dtype=SYMBOL_STATICS_DTYPE)
+        
+        self.__symbol_statics = np.append(self.__symbol_statics, statics)
+        self.__margin_functions[symbol] = _margin_function(*coefficients)
+        
+        symbol_id = len(self.__symbol_ids)
+        self.__symbol_ids[symbol] = symbol_id
+        
+        return symbol_id
+    
+    def __positions_margins(self, statics: np.ndarray) -> np.ndarray:
+        
+        """Margins of all open positions at their current prices, from their symbols' linear margin coefficients (statics, row aligned with the book), rounded like order_calc_margin"""
+        
+        book = self.__positions_book
+        volumes = book.column("volume")
+        
+        return np.round(statics["margin_a"] * volumes * book.column("price_current") + statics["margin_b"] * volumes, 2)
+    
+    def __account_update(self, unrealized_pl: float, total_margin: float):
+        
+        account = self.AccountInfo
+        equity = account.balance + unrealized_pl
+        
+        account.profit = unrealized_pl
+        account.equity = equity
+        account.margin = total_margin
+        account.margin_free = equity - total_margin
+        account.margin_level = equity / total_margin * 100 if total_margin > 0 else 0
+        
+        self.__account_snapshot = None
+    
+    def __get_profit_params(self, symbol: str) -> tuple:
+        
+        params = self.__profit_params.get(symbol)
+        if params is not None:
+            return params
+        
+        sym = self.symbol_info(symbol)
+        calculator = self.__profit_calculators.get(sym.trade_calc_mode)
+        
+        kind = -1 # left to order_calc_profit
+        factor = face_value = accrued_interest = 0.0
+        
+        if calculator == self.__profit_by_contract:
+            kind, factor = PROFIT_BY_CONTRACT, sym.trade_contract_size
+        elif calculator == self.__profit_by_ticks and sym.trade_tick_size > 0:
+            kind, factor = PROFIT_BY_TICKS, sym.trade_tick_value / sym.trade_tick_size
+        elif calculator == self.__profit_bonds:
+            kind, factor = PROFIT_BONDS, sym.trade_contract_size
+            face_value, accrued_interest = sym.trade_face_value, sym.trade_accrued_interest
+        
+        params = (kind, factor, face_value, accrued_interest)
+        self.__profit_params[symbol] = params
+        
+        return params
+    
+    def __positions_profits(self, statics: np.ndarray, is_buy: np.ndarray, prices: np.ndarray) -> np.ndarray:
+        
+        """Unrounded profits of all open positions at the given close prices, NaN for the kinds left to order_calc_profit"""
+        
+        book = self.__positions_book
+        
+        kinds = statics["profit_kind"]
+        factors = statics["profit_factor"]
+        face_values = statics["face_value"]
+        accrued_interests = statics["accrued_interest"]
+        volumes = book.column("volume")
+        opens = book.column("price_open")
+        
+        price_delta = (prices - opens) * np.where(is_buy, 1.0, -1.0)
+        
+        return np.select(
+            [kinds == PROFIT_BY_CONTRACT, kinds == PROFIT_BY_TICKS, kinds == PROFIT_BONDS],
+            [price_delta * factors * volumes, price_delta * volumes * factors,
+             volumes * factors * (face_values * (prices - opens) + accrued_interests)],
+            default=np.nan
+        )
+    
+    def __round_profits(self, profits: np.ndarray, prices: np.ndarray) -> np.ndarray:
+        
+        """Rounds the bulk computed profits, the same as order_calc_profit which fills in the kinds its formulas don't cover"""
+        
+        book = self.__positions_book
+        profits = np.round(profits, 2)
+        
+        for i in np.flatnonzero(np.isnan(profits)).tolist():
+            pos = book.objects[i]
+            profits[i] = self.order_calc_profit(order_type=pos.type,
                                                 symbol=pos.symbol,
                                                 volume=pos.volume,
-                                                price=pos.price_current)
+                                                price_open=pos.price_open,
+                                                price_close=float(prices[i]))
+        
+        return profits
+    
+    def __monitor_positions(self, statics: np.ndarray, is_buy: np.ndarray, bids: np.ndarray, asks: np.ndarray) -> tuple:
+        
+        """Runs the fused monitoring kernel over the positions book"""
+        
+        book = self.__positions_book
+        n = len(book)
+        
+        prices = np.empty(n, dtype=np.float64)
+        profits = np.empty(n, dtype=np.float64)
+        exits = np.empty(n, dtype=np.int8)
+        
+        unrealized_pl, total_margin = monitor_positions(is_buy,
+                                                        book.column("volume"),
+                                                        book.column("price_open"),
+                                                        book.column("price_current"),
+                                                        book.column("profit"),
+                                                        book.column("sl"),
+                                                        book.column("tp"),
+                                                        bids,
+                                                        asks,
+                                                        statics["profit_kind"],
+                                                        statics["profit_factor"],
+                                                        statics["face_value"],
+                                                        statics["accrued_interest"],
+                                                        statics["margin_a"],
+                                                        statics["margin_b"],
+                                                        prices, profits, exits)
+        
+        return float(unrealized_pl), float(total_margin), prices, profits, exits
+    
+    def __sync_positions(self):
+        
+        """Swaps in position records carrying the monitored prices and profits, deferred until they are looked at"""
+        
+        if self.__positions_synced:
+            return
+        
+        book = self.__positions_book
+        make_position = TradePosition._make
+        i_price, i_profit, i_time_update, i_time_update_msc = _SYNCED_POSITION_FIELDS
+        
+        for pos, price, profit, time_update, time_update_msc in zip(list(book.objects), 
+                                                                    book.column("price_current").tolist(),
+                                                                    book.column("profit").tolist(),
+                                                                    book.column("time_update").tolist(),
+                                                                    book.column("time_update_msc").tolist()):
             
-        self.AccountInfo = self.AccountInfo._replace(
-            profit=unrealized_pl,
-            equity=self.AccountInfo.balance + unrealized_pl,
-            margin=total_margin
-        )
+            fields = list(pos) # patched in place and handed to _make, cheaper than _replace's keyword arguments
+            fields[i_price] = price
+            fields[i_profit] = profit
+            fields[i_time_update] = time_update
+            fields[i_time_update_msc] = time_update_msc
+            
+            self.__replace_position(make_position(fields))
         
-        self.AccountInfo = self.AccountInfo._replace(
-            margin_free=self.AccountInfo.equity - self.AccountInfo.margin,
-            margin_level=self.AccountInfo.equity / self.AccountInfo.margin * 100 if self.AccountInfo.margin > 0 else 0
-        )
+        self.__positions_synced = True
     
     def __positions_monitoring(self):
         """
-        Monitors all open positions:
+        Monitors all open positions in a single pass over the book:
+        - updates the account's profit, equity and margin
         - updates profit
         - checks SL / TP
         - closes positions when hit
         """
 
-        for i in range(len(self.__positions_container__) - 1, -1, -1):
-            
-            pos = self.__positions_container__[i]
+        book = self.__positions_book
+        if len(book) == 0:
+            self.__account_update(unrealized_pl=0, total_margin=0)
+            return
+        
+        ids = book.column("symbol_id")
+        statics = self.__symbol_statics[ids] # gathered once for both the margins and the profits
+        
+        types = book.column("type")
+        is_buy = types == POSITION_TYPE_BUY
+        is_sell = types == POSITION_TYPE_SELL
+        bids = self.__sym_bid[ids]
+        asks = self.__sym_ask[ids]
+        
+        # the account is valued at the prices of the previous pass, before the positions are brought up to date from the latest prices of their symbols
+        
+        if JIT_ENABLED:
+            unrealized_pl, total_margin, prices, profits, exits = self.__monitor_positions(statics, is_buy, bids, asks)
             
-            tick = self.tick_cache[pos.symbol]
-
-            # --- Determine close price and opposite order type ---
-            if pos.type == self.mt5_instance.POSITION_TYPE_BUY:
-                price = tick.bid
-                close_type = self.mt5_instance.ORDER_TYPE_SELL
-            elif pos.type == self.mt5_instance.POSITION_TYPE_SELL:
-                price = tick.ask
-                close_type = self.mt5_instance.ORDER_TYPE_BUY
-            else:
-                self.logger.warning("Unknown position type")
-                continue
-
-            # --- Update floating profit ---
+            hit_tp = exits == EXIT_TP
+            hit_sl = exits == EXIT_SL
+        else:
+            unrealized_pl = float(book.column("profit").sum())
+            total_margin = float(self.__positions_margins(statics).sum())
             
-            profit = self.order_calc_profit(
-                    order_type=pos.type,
-                    symbol=pos.symbol,
-                    volume=pos.volume,
-                    price_open=pos.price_open,
-                    price_close=price
-                )
+            prices = np.where(is_buy, bids, asks)
+            profits = self.__positions_profits(statics, is_buy, prices)
             
             # --- Check SL / TP ---
-            hit_tp = False
-            hit_sl = False
-
-            if pos.tp > 0:
-                hit_tp = (
-                    price >= pos.tp if pos.type == self.mt5_instance.POSITION_TYPE_BUY
-                    else price <= pos.tp
-                )
-
-            if pos.sl > 0:
-                hit_sl = (
-                    price <= pos.sl if pos.type == self.mt5_instance.POSITION_TYPE_BUY
-                    else price >= pos.sl
-                )
-                
-            pos = pos._replace(
-                profit=profit,
-                price_current=price,
-                time_update=tick.time,
-                time_update_msc=tick.time_msc
-            )
-
-            # MUST write it back
-            self.__positions_container__[i] = pos
-
-            # self.logger.debug(pos) #TODO:
             
-            if not (hit_tp or hit_sl):
-                continue
-
-            # --- Close position ---
+            tp = book.column("tp")
+            sl = book.column("sl")
+            has_tp = tp > 0
+            has_sl = sl > 0
+            
+            hit_tp = (is_buy & has_tp & (prices >= tp)) | (is_sell & has_tp & (prices <= tp))
+            hit_sl = ~hit_tp & ((is_buy & has_sl & (prices <= sl)) | (is_sell & has_sl & (prices >= sl)))
+        
+        times = self.__sym_time[ids]
+        times_msc = self.__sym_time_msc[ids]
+        
+        unknown = ~(is_buy | is_sell)
+        if unknown.any(): # positions of an unknown type are skipped, they keep their values and are never closed
+            
+            for i in np.flatnonzero(unknown).tolist():
+                self.logger.warning(f"Unknown position type, position {book.objects[i].ticket} skipped")
+            
+            prices[unknown] = book.column("price_current")[unknown]
+            profits[unknown] = book.column("profit")[unknown]
+            times[unknown] = book.column("time_update")[unknown]
+            times_msc[unknown] = book.column("time_update_msc")[unknown]
+            
+            hit_tp = hit_tp & ~unknown
+            hit_sl = hit_sl & ~unknown
+        
+        self.__account_update(unrealized_pl=unrealized_pl, total_margin=total_margin) # the sum of the positions' order_calc_margin
+        
+        book.column("price_current")[:] = prices
+        book.column("profit")[:] = self.__round_profits(profits, prices)
+        book.column("time_update")[:] = times
+        book.column("time_update_msc")[:] = times_msc
+        
+        self.__positions_synced = False
+        
+        hits = np.flatnonzero(hit_tp | hit_sl)
+        if hits.size == 0:
+            return
+        
+        # --- Close positions, the newest first ---
+        
+        positions = list(book.objects) # a snapshot, rows shift as positions get closed
+        
+        for i in hits[::-1].tolist():
+            
+            pos = positions[i]
+            
             request = {
-                "action": self.mt5_instance.TRADE_ACTION_DEAL,
-                "type": close_type,
+                "action": TRADE_ACTION_DEAL,
+                "type": ORDER_TYPE_SELL if pos.type == POSITION_TYPE_BUY else ORDER_TYPE_BUY,
                 "symbol": pos.symbol,
-                "price": price,
+                "price": float(prices[i]),
                 "volume": pos.volume,
                 "position": pos.ticket,
-                "comment": "TP hit" if hit_tp else "SL hit",
+                "comment": "TP hit" if hit_tp[i] else "SL hit",
             }
 
             self.order_send(request)
@@ -1825,68 +2330,63 @@ class StrategyTester:
         - converts them into market positions
         """
 
-        for order in list(self.__orders_container__):
-
-            symbol = order.symbol
-            tick = self.tick_cache[symbol]
-
-            # --- Expiration handling ---
-            if order.time_expiration > 0 and tick.time >= order.time_expiration:
-                self.__orders_container__.remove(order)
-                continue
-
-            triggered = False
-            deal_type = None
-            deal_price = None
-
-            # -------- BUY ORDERS --------
-            if order.type == self.mt5_instance.ORDER_TYPE_BUY_LIMIT:
-                if tick.ask <= order.price:
-                    triggered = True
-                    deal_type = self.mt5_instance.ORDER_TYPE_BUY
-                    deal_price = order.price
-
-            elif order.type == self.mt5_instance.ORDER_TYPE_BUY_STOP:
-                if tick.ask >= order.price:
-                    triggered = True
-                    deal_type = self.mt5_instance.ORDER_TYPE_BUY
-                    deal_price = tick.ask
-
-            elif order.type == self.mt5_instance.ORDER_TYPE_BUY_STOP_LIMIT:
-                if tick.ask >= order.price:
-                    # Convert to BUY LIMIT at stoplimit price
-                    order.type = self.mt5_instance.ORDER_TYPE_BUY_LIMIT
-                    order.price = order.price_stoplimit
-                continue
-
-            # -------- SELL ORDERS --------
-            elif order.type == self.mt5_instance.ORDER_TYPE_SELL_LIMIT:
-                if tick.bid >= order.price:
-                    triggered = True
-                    deal_type = self.mt5_instance.ORDER_TYPE_SELL
-                    deal_price = order.price
-
-            elif order.type == self.mt5_instance.ORDER_TYPE_SELL_STOP:
-                if tick.bid <= order.price:
-                    triggered = True
-                    deal_type = self.mt5_instance.ORDER_TYPE_SELL
-                    deal_price = tick.bid
-
-            elif order.type == self.mt5_instance.ORDER_TYPE_SELL_STOP_LIMIT:
-                if tick.bid <= order.price:
-                    order.type = self.mt5_instance.ORDER_TYPE_SELL_LIMIT
-                    order.price = order.price_stoplimit
-                continue
-
-            if not triggered:
+        book = self.__orders_book
+        if len(book) == 0:
+            return
+        
+        # --- Expirations and trigger conditions of all orders at once, against their symbols' latest ticks ---
+        
+        if JIT_ENABLED:
+            n = len(book)
+            actions = np.empty(n, dtype=np.int8)
+            deal_prices = np.empty(n, dtype=np.float64)
+            
+            expired = monitor_orders(book.column("type"),
+                                     book.column("price_open"),
+                                     book.column("time_expiration"),
+                                     book.column("symbol_id"),
+                                     self.__sym_bid,
+                                     self.__sym_ask,
+                                     self.__sym_time,
+                                     actions, deal_prices)
+        else:
+            actions, deal_prices = self.__pending_orders_actions()
+            expired = int(np.count_nonzero(actions == PENDING_EXPIRED))
+        
+        if expired > 0:
+            keep = actions != PENDING_EXPIRED
+            self.__drop_orders(keep)
+            
+            actions = actions[keep]
+            deal_prices = deal_prices[keep]
+        
+        hits = np.flatnonzero(actions > PENDING_EXPIRED)
+        if hits.size == 0:
+            return
+        
+        actions = actions.tolist()
+        deal_prices = deal_prices.tolist()
+        orders = list(book.objects) # a snapshot, orders get removed along the way
+        
+        for i in hits.tolist():
+            
+            order = orders[i]
+            
+            if actions[i] == PENDING_STOP_LIMIT:
+                # Convert to a LIMIT order at the stoplimit price
+                order = order._replace(type=ORDER_TYPE_BUY_LIMIT if order.type == ORDER_TYPE_BUY_STOP_LIMIT else ORDER_TYPE_SELL_LIMIT,
+                                       price_open=order.price_stoplimit)
+                self.__replace_order(order)
+                book.set(order.ticket, "type", order.type)
+                book.set(order.ticket, "price_open", order.price_open)
                 continue
 
             # ----- Execute pending order -----
             request = {
-                "action": self.mt5_instance.TRADE_ACTION_DEAL,
-                "symbol": symbol,
-                "type": deal_type,
-                "price": deal_price,
+                "action": TRADE_ACTION_DEAL,
+                "symbol": order.symbol,
+                "type": ORDER_TYPE_BUY if actions[i] == PENDING_FILL_BUY else ORDER_TYPE_SELL,
+                "price": deal_prices[i],
                 "sl": order.sl,
                 "tp": order.tp,
                 "volume": order.volume_current,
@@ -1897,8 +2397,38 @@ class StrategyTester:
             result = self.order_send(request)
 
             # ----- Remove pending order after successful execution -----
-            if result and result.get("retcode") == self.mt5_instance.TRADE_RETCODE_DONE:
-                self.__orders_container__.remove(order)
+            if result and result.get("retcode") == TRADE_RETCODE_DONE:
+                self.__remove_order(order)
+    
+    def __pending_orders_actions(self) -> tuple:
+        
+        """monitor_orders written with numpy array operations, for when numba isn't installed"""
+        
+        book = self.__orders_book
+        
+        ids = book.column("symbol_id")
+        types = book.column("type")
+        opens = book.column("price_open")
+        expirations = book.column("time_expiration")
+        asks = self.__sym_ask[ids]
+        bids = self.__sym_bid[ids]
+        
+        expired = (expirations > 0) & (expirations <= self.__sym_time[ids])
+        
+        buy_limit = (types == ORDER_TYPE_BUY_LIMIT) & (asks <= opens)
+        buy_stop = (types == ORDER_TYPE_BUY_STOP) & (asks >= opens)
+        sell_limit = (types == ORDER_TYPE_SELL_LIMIT) & (bids >= opens)
+        sell_stop = (types == ORDER_TYPE_SELL_STOP) & (bids <= opens)
+        
+        stop_limit = ((types == ORDER_TYPE_BUY_STOP_LIMIT) & (asks >= opens)) | ((types == ORDER_TYPE_SELL_STOP_LIMIT) & (bids <= opens))
+        
+        actions = np.select([expired, buy_limit | buy_stop, sell_limit | sell_stop, stop_limit],
+                            [PENDING_EXPIRED, PENDING_FILL_BUY, PENDING_FILL_SELL, PENDING_STOP_LIMIT],
+                            default=PENDING_WAIT).astype(np.int8)
+        
+        deal_prices = np.where(buy_stop, asks, np.where(sell_stop, bids, opens)) # stops fill at the market, limits at their price
+        
+        return actions, deal_prices
     
     def _bar_to_tick(self, symbol, bar):
         """
@@ -1939,13 +2469,16 @@ class StrategyTester:
         if modelling == "real_ticks" or modelling == "every_tick":
             
             total_ticks = sum(ticks_info["size"] for ticks_info in self.TESTER_ALL_TICKS_INFO)
+            
+            for ticks_info in self.TESTER_ALL_TICKS_INFO: # converted once instead of building every tick from a polars row
+                ticks_info["records"] = _tick_records(ticks_info["ticks"])
+                ticks_info["symbol_id"] = self.__symbol_id(ticks_info["symbol"])
 
             self.logger.debug(f"total number of ticks: {total_ticks}")
 
             with tqdm(total=total_ticks, desc="StrategyTester Progress", unit="tick") as pbar:
                 while True:
                     
-                    self.__account_monitoring()
                     self.__positions_monitoring()
                     self.__pending_orders_monitoring()
                     
@@ -1960,10 +2493,8 @@ class StrategyTester:
                         if counter >= size:
                             continue
 
-                        current_tick = ticks_info["ticks"].row(counter)
-                        
-                        current_tick = make_tick_from_tuple(current_tick)
-                        self.TickUpdate(symbol=symbol, tick=current_tick)
+                        current_tick = Tick._make(ticks_info["records"][counter].item())
+                        self.__set_tick(symbol, ticks_info["symbol_id"], current_tick)
                         
                         self.__curves_update(current_tick.time)
                         ontick_func()
@@ -1981,12 +2512,14 @@ class StrategyTester:
             bars_ = [bars_info["size"] for bars_info in self.TESTER_ALL_BARS_INFO]
             total_bars = sum(bars_)
             
+            for bars_info in self.TESTER_ALL_BARS_INFO:
+                bars_info["symbol_id"] = self.__symbol_id(bars_info["symbol"])
+            
             self.logger.debug(f"total number of bars: {total_bars}")
 
             with tqdm(total=total_bars, desc="StrategyTester Progress", unit="bar") as pbar:
                 while True:
                     
-                    self.__account_monitoring()
                     self.__positions_monitoring()
                     self.__pending_orders_monitoring()
                     
@@ -2007,7 +2540,7 @@ class StrategyTester:
                         
                         # Getting ticks at the current bar
                         
-                        self.TickUpdate(symbol=symbol, tick=current_tick)
+                        self.__set_tick(symbol, bars_info["symbol_id"], make_tick_from_dict(current_tick))
                         ontick_func()
 
                         bars_info["counter"] = counter + 1
@@ -2030,8 +2563,8 @@ class StrategyTester:
             order=0,
             time=time_sec,
             time_msc=time_msc,
-            type=self.mt5_instance.DEAL_TYPE_BALANCE,
-            entry=self.mt5_instance.DEAL_ENTRY_IN,
+            type=DEAL_TYPE_BALANCE,
+            entry=DEAL_ENTRY_IN,
             magic=0,
             position_id=0,
             reason=np.nan,
@@ -2059,10 +2592,6 @@ class StrategyTester:
         #     self.__make_balance_deal(time=self.tester_config["end_date"])
         # )
         
-        profits = []
-        losses = []
-        total_trades = 0
-        
         max_consec_win_count = 0
         max_consec_win_money = 0.0
 
@@ -2084,77 +2613,68 @@ class StrategyTester:
         win_streaks = []
         loss_streaks = []
         
-        short_trades_won = 0
-        long_trades_won = 0
+        deals = self.__deals_history_container__.columns
+        closed = deals[deals["entry"] == DEAL_ENTRY_OUT] # closed positions
+        
+        is_long = closed["type"] == DEAL_TYPE_BUY
+        is_short = closed["type"] == DEAL_TYPE_SELL
+        is_win = closed["profit"] > 0
+        
+        total_trades = closed.size
+        total_long_trades = int(np.count_nonzero(is_long))
+        total_short_trades = int(np.count_nonzero(is_short))
         
-        total_short_trades = 0
-        total_long_trades = 0
+        long_trades_won = int(np.count_nonzero(is_long & is_win))
+        short_trades_won = int(np.count_nonzero(is_short & is_win))
         
-        for deal in self.__deals_history_container__:
-            if deal.entry == self.mt5_instance.DEAL_ENTRY_OUT: # a closed position
+        profits = closed["profit"][is_win].tolist()
+        losses = closed["profit"][~is_win].tolist()
+        
+        for profit in closed["profit"].tolist():
+            
+            if profit > 0: # A win
                 
-                total_trades +=1
-                if deal.type == self.mt5_instance.DEAL_TYPE_BUY:
-                    total_long_trades += 1
+                # reset loss streak
+                if cur_loss_count > 0:
+                    loss_streaks.append(cur_loss_count)
+                    cur_loss_count = 0
+                    cur_loss_money = 0.0
+
+                cur_win_count += 1
+                cur_win_money += profit
+
+                # longest win streak
+                if cur_win_count > max_consec_win_count:
+                    max_consec_win_count = cur_win_count
+                    max_consec_win_money = cur_win_money
+
+                # most profitable win streak
+                if cur_win_money > max_profit_streak_money:
+                    max_profit_streak_money = cur_win_money
+                    max_profit_streak_count = cur_win_count
+
+            else: # A loss
                 
-                if deal.type == self.mt5_instance.DEAL_TYPE_SELL:
-                    total_short_trades += 1
+                # reset win streak
+                if cur_win_count > 0:
+                    win_streaks.append(cur_win_count)
+                    cur_win_count = 0
+                    cur_win_money = 0.0
+
+                cur_loss_count += 1
+                cur_loss_money += profit
+
+                # longest loss streak
+                if cur_loss_count > max_consec_loss_count:
+                    max_consec_loss_count = cur_loss_count
+                    max_consec_loss_money = cur_loss_money
+
+                # largest losing streak
+                if cur_loss_money < max_loss_streak_money:
+                    max_loss_streak_money = cur_loss_money
+                    max_loss_streak_count = cur_loss_count
                 
-                profit = deal.profit
-                    
-                if profit > 0: # A win
-                    
-                    profits.append(profit)
-                    
-                    # reset loss streak
-                    if cur_loss_count > 0:
-                        loss_streaks.append(cur_loss_count)
-                        cur_loss_count = 0
-                        cur_loss_money = 0.0
-
-                    cur_win_count += 1
-                    cur_win_money += profit
-
-                    # longest win streak
-                    if cur_win_count > max_consec_win_count:
-                        max_consec_win_count = cur_win_count
-                        max_consec_win_money = cur_win_money
-
-                    # most profitable win streak
-                    if cur_win_money > max_profit_streak_money:
-                        max_profit_streak_money = cur_win_money
-                        max_profit_streak_count = cur_win_count
-
-                    if deal.type == self.mt5_instance.DEAL_TYPE_BUY:
-                        long_trades_won += 1
-                    
-                    if deal.type == self.mt5_instance.DEAL_TYPE_SELL:
-                        short_trades_won += 1
-                        
-                else: # A loss
-                    
-                    losses.append(profit)
-                    
-                    # reset win streak
-                    if cur_win_count > 0:
-                        win_streaks.append(cur_win_count)
-                        cur_win_count = 0
-                        cur_win_money = 0.0
-
-                    cur_loss_count += 1
-                    cur_loss_money += profit
-
-                    # longest loss streak
-                    if cur_loss_count > max_consec_loss_count:
-                        max_consec_loss_count = cur_loss_count
-                        max_consec_loss_money = cur_loss_money
-
-                    # largest losing streak
-                    if cur_loss_money < max_loss_streak_money:
-                        max_loss_streak_money = cur_loss_money
-                        max_loss_streak_count = cur_loss_count
-                    
-        
+    
         self.tester_stats["Gross Profit"] = np.sum(profits) if profits else 0
         self.tester_stats["Gross Loss"] = np.sum(losses) if losses else 0
         self.tester_stats["Net Profit"] = self.tester_stats["Gross Profit"] + self.tester_stats["Gross Loss"]
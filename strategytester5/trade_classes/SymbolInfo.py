@@ -70,6 +70,12 @@ class CSymbolInfo:
             print(f"Refresh error: {str(e)}")
             return False
 
+    def rates(self) -> tuple:
+        
+        """Returns the (ask, bid, point) stored by the last refresh_rates(), so that callers can unpack them in a single call"""
+        
+        return self.ticks_info['ask'], self.ticks_info['bid'], self.info.point
+
 
     # --- properties
     
@@ -1,4 +1,14 @@
 import MetaTrader5 as mt5
+from MetaTrader5 import ( # constants resolved once instead of on every request
+    TRADE_ACTION_DEAL, TRADE_ACTION_PENDING, TRADE_ACTION_SLTP, TRADE_ACTION_MODIFY, TRADE_ACTION_REMOVE,
+    ORDER_TYPE_BUY, ORDER_TYPE_SELL,
+    ORDER_TYPE_BUY_LIMIT, ORDER_TYPE_SELL_LIMIT,
+    ORDER_TYPE_BUY_STOP, ORDER_TYPE_SELL_STOP,
+    ORDER_TYPE_BUY_STOP_LIMIT, ORDER_TYPE_SELL_STOP_LIMIT,
+    POSITION_TYPE_BUY,
+    ORDER_TIME_GTC, ORDER_TIME_SPECIFIED, ORDER_TIME_SPECIFIED_DAY,
+    ORDER_FILLING_FOK, ORDER_FILLING_IOC, ORDER_FILLING_BOC, ORDER_FILLING_RETURN,
+)
 from datetime import datetime, timezone
 from strategytester5 import *
 
@@ -23,10 +33,10 @@ class CTrade:
             print(f"Failed to get symbol info for {symbol}")
         
         filling_map = {
-            1: self.mt5_instance.ORDER_FILLING_FOK,
-            2: self.mt5_instance.ORDER_FILLING_IOC,
-            4: self.mt5_instance.ORDER_FILLING_BOC,
-            8: self.mt5_instance.ORDER_FILLING_RETURN
+            1: ORDER_FILLING_FOK,
+            2: ORDER_FILLING_IOC,
+            4: ORDER_FILLING_BOC,
+            8: ORDER_FILLING_RETURN
         }
         
         return filling_map.get(symbol_info.filling_mode, f"Unknown Filling type")
@@ -55,7 +65,7 @@ class CTrade:
         """
         
         request = {
-            "action": self.mt5_instance.TRADE_ACTION_DEAL,
+            "action": TRADE_ACTION_DEAL,
             "symbol": symbol,
             "volume": volume,
             "type": order_type,
@@ -63,7 +73,7 @@ class CTrade:
             "deviation": self.deviation_points,
             "magic": self.magic_number,
             "comment": comment,
-            "type_time": self.mt5_instance.ORDER_TIME_GTC,
+            "type_time": ORDER_TIME_GTC,
             "type_filling":  self.filling_type,
         }
         
@@ -105,12 +115,12 @@ class CTrade:
         """
         
         # Validate expiration for time-specific orders
-        if type_time in (self.mt5_instance.ORDER_TIME_SPECIFIED, self.mt5_instance.ORDER_TIME_SPECIFIED_DAY) and expiration is None:
+        if type_time in (ORDER_TIME_SPECIFIED, ORDER_TIME_SPECIFIED_DAY) and expiration is None:
             print(f"Expiration required for order type {type_time}")
             return False
         
         request = {
-            "action": self.mt5_instance.TRADE_ACTION_PENDING,
+            "action": TRADE_ACTION_PENDING,
             "symbol": symbol,
             "volume": volume,
             "type": order_type,
@@ -125,7 +135,7 @@ class CTrade:
         }
         
         # Add expiration if required
-        if type_time in (self.mt5_instance.ORDER_TIME_SPECIFIED, self.mt5_instance.ORDER_TIME_SPECIFIED_DAY) and expiration is not None:
+        if type_time in (ORDER_TIME_SPECIFIED, ORDER_TIME_SPECIFIED_DAY) and expiration is not None:
             
             # Convert to broker's expected format (UTC timestamp in milliseconds)
             
@@ -159,7 +169,7 @@ class CTrade:
             bool: True if order was sent successfully, False otherwise
         """
     
-        return self.position_open(symbol=symbol, volume=volume, order_type=self.mt5_instance.ORDER_TYPE_BUY, price=price, sl=sl, tp=tp, comment=comment)
+        return self.position_open(symbol=symbol, volume=volume, order_type=ORDER_TYPE_BUY, price=price, sl=sl, tp=tp, comment=comment)
 
     def sell(self, volume: float, symbol: str, price: float, sl: float=0.0, tp: float=0.0, comment: str="") -> bool:
         
@@ -178,7 +188,7 @@ class CTrade:
             bool: True if order was sent successfully, False otherwise
         """
         
-        return self.position_open(symbol=symbol, volume=volume, order_type=self.mt5_instance.ORDER_TYPE_SELL, price=price, sl=sl, tp=tp, comment=comment)
+        return self.position_open(symbol=symbol, volume=volume, order_type=ORDER_TYPE_SELL, price=price, sl=sl, tp=tp, comment=comment)
     
     def buy_limit(self, volume: float, price: float, symbol: str, sl: float=0.0, tp: float=0.0, type_time: float=mt5.ORDER_TIME_GTC, expiration: datetime=None, comment: str="") -> bool:
         
@@ -203,7 +213,7 @@ class CTrade:
             bool: True if order was placed successfully, False otherwise
         """
         
-        return self.order_open(symbol=symbol, volume=volume, order_type=self.mt5_instance.ORDER_TYPE_BUY_LIMIT, price=price, sl=sl, tp=tp, type_time=type_time, expiration=expiration, comment=comment)
+        return self.order_open(symbol=symbol, volume=volume, order_type=ORDER_TYPE_BUY_LIMIT, price=price, sl=sl, tp=tp, type_time=type_time, expiration=expiration, comment=comment)
         
     def sell_limit(self, volume: float, price: float, symbol: str, sl: float=0.0, tp: float=0.0, type_time: float=mt5.ORDER_TIME_GTC, expiration: datetime=None, comment: str="") -> bool:
             
@@ -228,7 +238,7 @@ class CTrade:
             bool: True if order was placed successfully, False otherwise
         """
 
-        return self.order_open(symbol=symbol, volume=volume, order_type=self.mt5_instance.ORDER_TYPE_SELL_LIMIT, price=price, sl=sl, tp=tp, type_time=type_time, expiration=expiration, comment=comment)
+        return self.order_open(symbol=symbol, volume=volume, order_type=ORDER_TYPE_SELL_LIMIT, price=price, sl=sl, tp=tp, type_time=type_time, expiration=expiration, comment=comment)
         
     def buy_stop(self, volume: float, price: float, symbol: str, sl: float=0.0, tp: float=0.0, type_time: float=mt5.ORDER_TIME_GTC, expiration: datetime=None, comment: str="") -> bool:
 
@@ -253,7 +263,7 @@ class CTrade:
             bool: True if order was placed successfully, False otherwise
         """
         
-        return self.order_open(symbol=symbol, volume=volume, order_type=self.mt5_instance.ORDER_TYPE_BUY_STOP, price=price, sl=sl, tp=tp, type_time=type_time, expiration=expiration, comment=comment)
+        return self.order_open(symbol=symbol, volume=volume, order_type=ORDER_TYPE_BUY_STOP, price=price, sl=sl, tp=tp, type_time=type_time, expiration=expiration, comment=comment)
         
     def sell_stop(self, volume: float, price: float, symbol: str, sl: float=0.0, tp: float=0.0, type_time: float=mt5.ORDER_TIME_GTC, expiration: datetime=None, comment: str="") -> bool:
         
@@ -278,7 +288,7 @@ class CTrade:
             bool: True if order was placed successfully, False otherwise
         """
         
-        return self.order_open(symbol=symbol, volume=volume, order_type=self.mt5_instance.ORDER_TYPE_SELL_STOP, price=price, sl=sl, tp=tp, type_time=type_time, expiration=expiration, comment=comment)
+        return self.order_open(symbol=symbol, volume=volume, order_type=ORDER_TYPE_SELL_STOP, price=price, sl=sl, tp=tp, type_time=type_time, expiration=expiration, comment=comment)
     
     """    
     def buy_stop_limit(self, volume: float, price: float, symbol: str, sl: float=0.0, tp: float=0.0, type_time: float=mt5.ORDER_TIME_GTC, expiration: datetime=None, comment: str="") -> bool:
@@ -304,7 +314,7 @@ class CTrade:
             bool: True if order was placed successfully, False otherwise
         \"""
         
-        return self.order_open(symbol=symbol, volume=volume, order_type=self.mt5_instance.ORDER_TYPE_BUY_STOP_LIMIT, price=price, sl=sl, tp=tp, type_time=type_time, expiration=expiration, comment=comment)
+        return self.order_open(symbol=symbol, volume=volume, order_type=ORDER_TYPE_BUY_STOP_LIMIT, price=price, sl=sl, tp=tp, type_time=type_time, expiration=expiration, comment=comment)
         
     def sell_stop_limit(self, volume: float, price: float, symbol: str, sl: float=0.0, tp: float=0.0, type_time: float=mt5.ORDER_TIME_GTC, expiration: datetime=None, comment: str="") -> bool:
         
@@ -329,7 +339,7 @@ class CTrade:
             bool: True if order was placed successfully, False otherwise
         \"""
         
-        return self.order_open(symbol=symbol, volume=volume, order_type=self.mt5_instance.ORDER_TYPE_SELL_STOP_LIMIT, price=price, sl=sl, tp=tp, type_time=type_time, expiration=expiration, comment=comment)
+        return self.order_open(symbol=symbol, volume=volume, order_type=ORDER_TYPE_SELL_STOP_LIMIT, price=price, sl=sl, tp=tp, type_time=type_time, expiration=expiration, comment=comment)
 
         """
         
@@ -364,13 +374,13 @@ class CTrade:
         # print("pos_type: ", position_type, " order type buy: ",self.mt5_instance.ORDER_TYPE_BUY, " order type sell: ",self.mt5_instance.ORDER_TYPE_SELL)
         
         tick_info = self.simulator.symbol_info_tick(symbol)
-        price = tick_info.bid if position_type == self.mt5_instance.POSITION_TYPE_BUY else tick_info.ask
+        price = tick_info.bid if position_type == POSITION_TYPE_BUY else tick_info.ask
 
         # Set close order type
-        order_type = self.mt5_instance.ORDER_TYPE_SELL if position_type == self.mt5_instance.POSITION_TYPE_BUY else self.mt5_instance.ORDER_TYPE_BUY
+        order_type = ORDER_TYPE_SELL if position_type == POSITION_TYPE_BUY else ORDER_TYPE_BUY
 
         request = {
-            "action": self.mt5_instance.TRADE_ACTION_DEAL,
+            "action": TRADE_ACTION_DEAL,
             "position": ticket,
             "symbol": symbol,
             "volume": volume,
@@ -378,7 +388,7 @@ class CTrade:
             "type": order_type,
             "price": price,
             "deviation": deviation if not isinstance(deviation, float) or not str(deviation) == 'nan' else self.deviation_points, 
-            "type_time": self.mt5_instance.ORDER_TIME_GTC,
+            "type_time": ORDER_TIME_GTC,
             "type_filling": self.filling_type,
         }
 
@@ -410,7 +420,7 @@ class CTrade:
             LOGGER.info(f"Order {order} not found!")
         
         request = {
-            "action": self.mt5_instance.TRADE_ACTION_REMOVE,
+            "action": TRADE_ACTION_REMOVE,
             "order": ticket,
             "magic": self.magic_number,
             "symbol": order.symbol
@@ -423,6 +433,20 @@ class CTrade:
 
         LOGGER.info(f"Order {ticket} deleted successfully!")
         return True
+    
+    def orders_delete(self, tickets: list) -> int:
+        
+        """
+        Deletes many pending orders at once, cheaper than calling order_delete for each of them.
+        
+        Args:
+            tickets: Order ticket numbers
+        
+        Returns:
+            int: Number of orders deleted
+        """
+        
+        return self.simulator.orders_delete(tickets)
             
 
     def position_modify(self, ticket: int, sl: float, tp: float) -> bool:
@@ -451,7 +475,7 @@ class CTrade:
         symbol = position.symbol
         
         request = {
-            "action": self.mt5_instance.TRADE_ACTION_SLTP,
+            "action": TRADE_ACTION_SLTP,
             "position": ticket,
             "magic": self.magic_number,
             "symbol": symbol,
@@ -497,7 +521,7 @@ class CTrade:
         order = order[0]  # Get the first (and only) order
         
         request = {
-            "action": self.mt5_instance.TRADE_ACTION_MODIFY,
+            "action": TRADE_ACTION_MODIFY,
             "order": ticket,
             "price": price,
             "sl": sl,
@@ -510,7 +534,7 @@ class CTrade:
         }
         
         # Add expiration if specified (for ORDER_TIME_SPECIFIED)
-        if type_time == self.mt5_instance.ORDER_TIME_SPECIFIED:
+        if type_time == ORDER_TIME_SPECIFIED:
             if expiration is None:
                 print("Error: expiration must be specified for ORDER_TIME_SPECIFIED")
                 return False
@@ -518,7 +542,7 @@ class CTrade:
             request["expiration"] = expiration
         
         # Add stoplimit for STOP_LIMIT orders
-        if order.type in (self.mt5_instance.ORDER_TYPE_BUY_STOP_LIMIT, self.mt5_instance.ORDER_TYPE_SELL_STOP_LIMIT):
+        if order.type in (ORDER_TYPE_BUY_STOP_LIMIT, ORDER_TYPE_SELL_STOP_LIMIT):
             request["stoplimit"] = stoplimit
 
         # Send the modification request
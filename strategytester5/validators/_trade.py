@@ -1,5 +1,10 @@
 from collections import namedtuple
 import MetaTrader5 as mt5
+from MetaTrader5 import ( # constants resolved once instead of on every check
+    ORDER_TYPE_BUY, ORDER_TYPE_SELL,
+    ORDER_TYPE_BUY_LIMIT, ORDER_TYPE_SELL_LIMIT,
+    ORDER_TYPE_BUY_STOP, ORDER_TYPE_SELL_STOP,
+)
 from typing import Dict
 from datetime import datetime
 from strategytester5 import *
@@ -59,28 +64,28 @@ class TradeValidators:
 
         # ---------------- Pending Orders ----------------
 
-        if order_type == self.mt5_instance.ORDER_TYPE_BUY_LIMIT:
+        if order_type == ORDER_TYPE_BUY_LIMIT:
             dist = ask - entry
             if dist < freeze_distance:
                 log_fail("BuyLimit cannot be modified: Ask - OpenPrice", dist)
                 return False
             return True
 
-        if order_type == self.mt5_instance.ORDER_TYPE_SELL_LIMIT:
+        if order_type == ORDER_TYPE_SELL_LIMIT:
             dist = entry - bid
             if dist < freeze_distance:
                 log_fail("SellLimit cannot be modified: OpenPrice - Bid", dist)
                 return False
             return True
 
-        if order_type == self.mt5_instance.ORDER_TYPE_BUY_STOP:
+        if order_type == ORDER_TYPE_BUY_STOP:
             dist = entry - ask
             if dist < freeze_distance:
                 log_fail("BuyStop cannot be modified: OpenPrice - Ask", dist)
                 return False
             return True
 
-        if order_type == self.mt5_instance.ORDER_TYPE_SELL_STOP:
+        if order_type == ORDER_TYPE_SELL_STOP:
             dist = bid - entry
             if dist < freeze_distance:
                 log_fail("SellStop cannot be modified: Bid - OpenPrice", dist)
@@ -90,7 +95,7 @@ class TradeValidators:
         # ---------------- Open Positions (SL / TP modification) ----------------
 
         # Buy position
-        if order_type == self.mt5_instance.ORDER_TYPE_BUY:
+        if order_type == ORDER_TYPE_BUY:
             if stop_price <= 0:
                 return True
 
@@ -108,7 +113,7 @@ class TradeValidators:
             return True
 
         # Sell position
-        if order_type == self.mt5_instance.ORDER_TYPE_SELL:
+        if order_type == ORDER_TYPE_SELL:
             if stop_price <= 0:
                 return True
 
@@ -226,12 +231,12 @@ class TradeValidators:
     def is_valid_entry(self, price: float, order_type: int) -> bool:
         
         eps = pow(10, -self.symbol_info.digits)
-        if order_type == self.mt5_instance.ORDER_TYPE_BUY:  # BUY
+        if order_type == ORDER_TYPE_BUY:  # BUY
             if not self.price_equal(a=price, b=self.ticks_info.ask, eps=eps):
                 self.logger.info(f"Trade validation failed: Buy price {price} != ask {self.ticks_info.ask}")
                 return False
 
-        elif order_type == self.mt5_instance.ORDER_TYPE_SELL:  # SELL
+        elif order_type == ORDER_TYPE_SELL:  # SELL
             if not self.price_equal(a=price, b=self.ticks_info.bid, eps=eps):
                 self.logger.info(f"Trade validation failed: Sell price {price} != bid {self.ticks_info.bid}")
                 return False
@@ -0,0 +1,149 @@
+import sys
+import types
+from collections import namedtuple
+
+import numpy as np
+
+# MetaTrader5 only ships for Windows and talks to a running terminal, the package imports it on load.
+# The tests run against this stand-in instead: the constants the package uses and deterministic history for a single symbol.
+
+CONSTANTS = dict(
+    ORDER_TYPE_BUY=0, ORDER_TYPE_SELL=1, ORDER_TYPE_BUY_LIMIT=2, ORDER_TYPE_SELL_LIMIT=3, ORDER_TYPE_BUY_STOP=4,
+    ORDER_TYPE_SELL_STOP=5, ORDER_TYPE_BUY_STOP_LIMIT=6, ORDER_TYPE_SELL_STOP_LIMIT=7, ORDER_TYPE_CLOSE_BY=8,
+
+    ORDER_STATE_STARTED=0, ORDER_STATE_PLACED=1, ORDER_STATE_CANCELED=2, ORDER_STATE_PARTIAL=3, ORDER_STATE_FILLED=4,
+    ORDER_STATE_REJECTED=5, ORDER_STATE_EXPIRED=6, ORDER_STATE_REQUEST_ADD=7, ORDER_STATE_REQUEST_MODIFY=8, ORDER_STATE_REQUEST_CANCEL=9,
+
+    ORDER_FILLING_FOK=0, ORDER_FILLING_IOC=1, ORDER_FILLING_RETURN=2, ORDER_FILLING_BOC=3,
+    ORDER_TIME_GTC=0, ORDER_TIME_DAY=1, ORDER_TIME_SPECIFIED=2, ORDER_TIME_SPECIFIED_DAY=3,
+
+    TRADE_ACTION_DEAL=1, TRADE_ACTION_PENDING=5, TRADE_ACTION_SLTP=6, TRADE_ACTION_MODIFY=7, TRADE_ACTION_REMOVE=8, TRADE_ACTION_CLOSE_BY=10,
+
+    TRADE_RETCODE_REQUOTE=10004, TRADE_RETCODE_REJECT=10006, TRADE_RETCODE_CANCEL=10007, TRADE_RETCODE_PLACED=10008,
+    TRADE_RETCODE_DONE=10009, TRADE_RETCODE_DONE_PARTIAL=10010, TRADE_RETCODE_ERROR=10011, TRADE_RETCODE_TIMEOUT=10012,
+    TRADE_RETCODE_INVALID=10013, TRADE_RETCODE_INVALID_VOLUME=10014, TRADE_RETCODE_INVALID_PRICE=10015,
+    TRADE_RETCODE_INVALID_STOPS=10016, TRADE_RETCODE_TRADE_DISABLED=10017, TRADE_RETCODE_MARKET_CLOSED=10018,
+    TRADE_RETCODE_NO_MONEY=10019, TRADE_RETCODE_PRICE_CHANGED=10020, TRADE_RETCODE_PRICE_OFF=10021,
+    TRADE_RETCODE_INVALID_EXPIRATION=10022, TRADE_RETCODE_ORDER_CHANGED=10023, TRADE_RETCODE_TOO_MANY_REQUESTS=10024,
+    TRADE_RETCODE_NO_CHANGES=10025, TRADE_RETCODE_SERVER_DISABLES_AT=10026, TRADE_RETCODE_CLIENT_DISABLES_AT=10027,
+    TRADE_RETCODE_LOCKED=10028, TRADE_RETCODE_FROZEN=10029, TRADE_RETCODE_INVALID_FILL=10030, TRADE_RETCODE_CONNECTION=10031,
+    TRADE_RETCODE_ONLY_REAL=10032, TRADE_RETCODE_LIMIT_ORDERS=10033, TRADE_RETCODE_LIMIT_VOLUME=10034,
+
+    POSITION_TYPE_BUY=0, POSITION_TYPE_SELL=1,
+
+    DEAL_TYPE_BUY=0, DEAL_TYPE_SELL=1, DEAL_TYPE_BALANCE=2, DEAL_TYPE_CREDIT=3, DEAL_TYPE_CHARGE=4, DEAL_TYPE_CORRECTION=5,
+    DEAL_TYPE_BONUS=6, DEAL_TYPE_COMMISSION=7, DEAL_TYPE_COMMISSION_DAILY=8, DEAL_TYPE_COMMISSION_MONTHLY=9,
+    DEAL_TYPE_COMMISSION_AGENT_DAILY=10, DEAL_TYPE_COMMISSION_AGENT_MONTHLY=11, DEAL_TYPE_INTEREST=12,
+    DEAL_TYPE_BUY_CANCELED=13, DEAL_TYPE_SELL_CANCELED=14,
+    DEAL_ENTRY_IN=0, DEAL_ENTRY_OUT=1, DEAL_ENTRY_INOUT=2, DEAL_ENTRY_OUT_BY=3,
+    DEAL_REASON_CLIENT=0, DEAL_REASON_MOBILE=1, DEAL_REASON_WEB=2, DEAL_REASON_EXPERT=3, DEAL_REASON_SL=4, DEAL_REASON_TP=5, DEAL_REASON_SO=6,
+
+    SYMBOL_CALC_MODE_FOREX=0, SYMBOL_CALC_MODE_FUTURES=1, SYMBOL_CALC_MODE_CFD=2, SYMBOL_CALC_MODE_CFDINDEX=3,
+    SYMBOL_CALC_MODE_CFDLEVERAGE=4, SYMBOL_CALC_MODE_FOREX_NO_LEVERAGE=5, SYMBOL_CALC_MODE_EXCH_STOCKS=32,
+    SYMBOL_CALC_MODE_EXCH_FUTURES=33, SYMBOL_CALC_MODE_EXCH_FUTURES_FORTS=34, SYMBOL_CALC_MODE_EXCH_BONDS=37,
+    SYMBOL_CALC_MODE_EXCH_STOCKS_MOEX=38, SYMBOL_CALC_MODE_EXCH_BONDS_MOEX=39, SYMBOL_CALC_MODE_SERV_COLLATERAL=64,
+
+    ACCOUNT_TRADE_MODE_DEMO=0, ACCOUNT_TRADE_MODE_CONTEST=1, ACCOUNT_TRADE_MODE_REAL=2,
+    ACCOUNT_STOPOUT_MODE_PERCENT=0, ACCOUNT_STOPOUT_MODE_MONEY=1,
+    ACCOUNT_MARGIN_MODE_RETAIL_NETTING=0, ACCOUNT_MARGIN_MODE_EXCHANGE=1, ACCOUNT_MARGIN_MODE_RETAIL_HEDGING=2,
+
+    COPY_TICKS_ALL=-1, COPY_TICKS_INFO=1, COPY_TICKS_TRADE=2,
+    TICK_FLAG_BID=2, TICK_FLAG_ASK=4, TICK_FLAG_LAST=8, TICK_FLAG_VOLUME=16, TICK_FLAG_BUY=32, TICK_FLAG_SELL=64,
+
+    TIMEFRAME_M1=1, TIMEFRAME_M2=2, TIMEFRAME_M3=3, TIMEFRAME_M4=4, TIMEFRAME_M5=5, TIMEFRAME_M6=6, TIMEFRAME_M10=10,
+    TIMEFRAME_M12=12, TIMEFRAME_M15=15, TIMEFRAME_M20=20, TIMEFRAME_M30=30, TIMEFRAME_H1=16385, TIMEFRAME_H2=16386,
+    TIMEFRAME_H3=16387, TIMEFRAME_H4=16388, TIMEFRAME_H6=16390, TIMEFRAME_H8=16392, TIMEFRAME_H12=16396,
+    TIMEFRAME_D1=16408, TIMEFRAME_W1=32769, TIMEFRAME_MN1=49153,
+)
+
+AccountInfo = namedtuple("AccountInfo", [
+    "login", "trade_mode", "leverage", "limit_orders", "margin_so_mode", "trade_allowed", "trade_expert", "margin_mode",
+    "currency_digits", "fifo_close", "balance", "credit", "profit", "equity", "margin", "margin_free", "margin_level",
+    "margin_so_call", "margin_so_so", "margin_initial", "margin_maintenance", "assets", "liabilities",
+    "commission_blocked", "name", "server", "currency", "company",
+])
+
+SymbolInfo = namedtuple("SymbolInfo", [
+    "name", "visible", "digits", "point", "trade_calc_mode", "trade_contract_size", "trade_tick_size", "trade_tick_value",
+    "trade_face_value", "trade_accrued_interest", "trade_stops_level", "trade_freeze_level", "margin_initial",
+    "margin_maintenance", "volume_min", "volume_max", "volume_step", "volume_limit", "filling_mode",
+])
+
+SYMBOLS = {
+    "EURUSD": SymbolInfo(name="EURUSD", visible=True, digits=5, point=1e-5, trade_calc_mode=CONSTANTS["SYMBOL_CALC_MODE_FOREX"],
+                         trade_contract_size=100000.0, trade_tick_size=1e-5, trade_tick_value=1.0, trade_face_value=0.0,
+                         trade_accrued_interest=0.0, trade_stops_level=0, trade_freeze_level=0, margin_initial=0.0,
+                         margin_maintenance=0.0, volume_min=0.01, volume_max=100.0, volume_step=0.01, volume_limit=0.0,
+                         filling_mode=1),
+}
+
+RATES_DTYPE = np.dtype([("time", "<i8"), ("open", "<f8"), ("high", "<f8"), ("low", "<f8"), ("close", "<f8"),
+                        ("tick_volume", "<u8"), ("spread", "<i4"), ("real_volume", "<u8")])
+
+TICKS_DTYPE = np.dtype([("time", "<i8"), ("bid", "<f8"), ("ask", "<f8"), ("last", "<f8"), ("volume", "<u8"),
+                        ("time_msc", "<i8"), ("flags", "<u4"), ("volume_real", "<f8")])
+
+TICK_SECONDS = 10 # one stored tick every 10 seconds
+TICK_FLAGS = (6, 24, 2, 0, 44, 4, 64) # cycled through by the stored ticks: bid|ask, last|volume, bid, none, ask|last|buy, ask, sell
+
+
+def account_info() -> AccountInfo:
+    return AccountInfo(login=1, trade_mode=0, leverage=100, limit_orders=0, margin_so_mode=0, trade_allowed=True,
+                       trade_expert=True, margin_mode=2, currency_digits=2, fifo_close=False, balance=1000.0, credit=0.0,
+                       profit=0.0, equity=1000.0, margin=0.0, margin_free=1000.0, margin_level=0.0, margin_so_call=50.0,
+                       margin_so_so=30.0, margin_initial=0.0, margin_maintenance=0.0, assets=0.0, liabilities=0.0,
+                       commission_blocked=0.0, name="tester", server="stub", currency="USD", company="stub")
+
+
+def copy_rates_range(symbol, timeframe, date_from, date_to) -> np.ndarray:
+
+    """Bars of timeframe (minutes or hours) between the dates, each opening a point above the previous one"""
+
+    seconds = timeframe * 60 if timeframe < CONSTANTS["TIMEFRAME_H1"] else (timeframe - 0x4000) * 3600
+    t0 = int(date_from.timestamp())
+    times = np.arange(t0 - t0 % seconds, int(date_to.timestamp()) + 1, seconds, dtype=np.int64)
+
+    rates = np.zeros(times.size, dtype=RATES_DTYPE)
+    rates["time"] = times
+    rates["open"] = 1.1 + np.arange(times.size) * SYMBOLS[symbol].point
+    rates["close"] = rates["open"]
+    rates["high"] = rates["open"] + 10 * SYMBOLS[symbol].point
+    rates["low"] = rates["open"] - 10 * SYMBOLS[symbol].point
+    rates["tick_volume"] = 1
+    rates["spread"] = 20
+
+    return rates
+
+
+def copy_ticks_range(symbol, date_from, date_to, flags) -> np.ndarray:
+
+    """A tick every TICK_SECONDS between the dates with its flags taken in turn from TICK_FLAGS, the flags argument is ignored"""
+
+    times = np.arange(int(date_from.timestamp()), int(date_to.timestamp()) + 1, TICK_SECONDS, dtype=np.int64)
+    steps = np.arange(times.size)
+
+    ticks = np.zeros(times.size, dtype=TICKS_DTYPE)
+    ticks["time"] = times
+    ticks["time_msc"] = times * 1000
+    ticks["bid"] = 1.1 + (steps % 20) * SYMBOLS[symbol].point
+    ticks["ask"] = ticks["bid"] + 20 * SYMBOLS[symbol].point
+    ticks["flags"] = np.resize(TICK_FLAGS, times.size)
+
+    return ticks
+
+
+def make_module() -> types.ModuleType:
+    module = types.ModuleType("MetaTrader5")
+    module.__dict__.update(CONSTANTS)
+    module.initialize = lambda *args, **kwargs: True
+    module.shutdown = lambda: True
+    module.last_error = lambda: (1, "Success")
+    module.account_info = account_info
+    module.symbol_info = SYMBOLS.get
+    module.symbol_select = lambda symbol, enable=True: symbol in SYMBOLS
+    module.copy_rates_range = copy_rates_range
+    module.copy_ticks_range = copy_ticks_range
+    return module
+
+
+sys.modules["MetaTrader5"] = make_module()
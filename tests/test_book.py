@@ -0,0 +1,104 @@
+import numpy as np
+import pytest
+
+from strategytester5 import TradeOrder
+from strategytester5._book import OpenBook, ORDERS_BOOK_FIELDS
+
+
+def make_order(ticket: int, price_open: float = 1.1, order_type: int = 2) -> TradeOrder:
+    return TradeOrder(ticket=ticket, time_setup=0, time_setup_msc=0, time_done=0, time_done_msc=0, time_expiration=0,
+                      type=order_type, type_time=0, type_filling=0, state=0, magic=0, position_id=0, position_by_id=0,
+                      reason=0, volume_initial=0.1, volume_current=0.1, price_open=price_open, sl=0.0, tp=0.0,
+                      price_current=0.0, price_stoplimit=0.0, symbol="EURUSD", comment="", external_id="")
+
+
+def make_book(tickets, capacity: int = 2) -> OpenBook:
+    book = OpenBook(ORDERS_BOOK_FIELDS, capacity=capacity)
+    for ticket in tickets:
+        book.add(make_order(ticket, price_open=float(ticket)), symbol_id=ticket % 3)
+    return book
+
+
+def assert_consistent(book: OpenBook):
+
+    """Every row's columns and object belong to the same record, and rows maps each ticket to it"""
+
+    assert len(book.objects) == len(book)
+    assert book.rows == {record.ticket: row for row, record in enumerate(book.objects)}
+    assert book.column("price_open").tolist() == [record.price_open for record in book.objects]
+    assert book.column("symbol_id").tolist() == [record.ticket % 3 for record in book.objects]
+
+
+def test_add_grows_past_capacity():
+    book = make_book(range(1, 8))
+
+    assert len(book) == 7
+    assert_consistent(book)
+
+
+@pytest.mark.parametrize("ticket", [1, 4, 7])
+def test_remove_shifts_the_rows_after_it(ticket):
+    book = make_book(range(1, 8))
+
+    book.remove(ticket)
+
+    assert len(book) == 6
+    assert ticket not in book.rows
+    assert [record.ticket for record in book.objects] == [t for t in range(1, 8) if t != ticket]
+    assert_consistent(book)
+
+
+def test_remove_until_empty():
+    book = make_book([1, 2, 3])
+
+    for ticket in (2, 3, 1):
+        book.remove(ticket)
+        assert_consistent(book)
+
+    assert len(book) == 0
+    assert book.column("price_open").size == 0
+
+    book.add(make_order(4, price_open=4.0), symbol_id=1) # reused after being emptied
+    assert_consistent(book)
+
+
+def test_compact():
+    book = make_book(range(1, 8))
+
+    book.compact(np.array([True, False, True, True, False, False, True]))
+
+    assert [record.ticket for record in book.objects] == [1, 3, 4, 7]
+    assert_consistent(book)
+
+    book.remove(3)
+    book.add(make_order(8, price_open=8.0), symbol_id=2)
+    assert [record.ticket for record in book.objects] == [1, 4, 7, 8]
+    assert_consistent(book)
+
+
+def test_compact_all_and_none():
+    book = make_book(range(1, 5))
+
+    book.compact(np.ones(4, dtype=bool))
+    assert len(book) == 4
+    assert_consistent(book)
+
+    book.compact(np.zeros(4, dtype=bool))
+    assert len(book) == 0
+    assert book.rows == {}
+
+
+def test_set_and_replace():
+    book = make_book([1, 2, 3])
+
+    updated = book.objects[1]._replace(price_open=9.0)
+    book.replace(updated)
+    book.set(2, "price_open", 9.0)
+
+    assert book.objects[1] is updated
+    assert book.column("price_open").tolist() == [1.0, 9.0, 3.0]
+
+    book.remove(1)
+    book.set(3, "type", 5)
+    assert book.column("type").tolist() == [2, 5]
+    assert book.rows == {2: 0, 3: 1}
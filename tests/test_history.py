@@ -0,0 +1,105 @@
+from strategytester5 import TradeDeal
+from strategytester5._history import HistoryTable, DEALS_HISTORY_DTYPE
+
+
+def make_deal(ticket: int, time: int, symbol: str = "EURUSD", position_id: int = 0) -> TradeDeal:
+    return TradeDeal(ticket=ticket, order=ticket, time=time, time_msc=time * 1000, type=0, entry=0, magic=0,
+                     position_id=position_id, reason=0, volume=0.1, price=1.1, commission=0.0, swap=0.0,
+                     profit=float(ticket), fee=0.0, symbol=symbol, comment="", external_id="", balance=0.0)
+
+
+def make_table(deals, capacity: int = 2) -> HistoryTable:
+    table = HistoryTable(DEALS_HISTORY_DTYPE, time_field="time", capacity=capacity)
+    for deal in deals:
+        table.append(deal)
+    return table
+
+
+def tickets(records) -> list:
+    return [record.ticket for record in records]
+
+
+def test_empty_table():
+    table = make_table([])
+
+    assert len(table) == 0
+    assert table.between(0, 100) == []
+    assert table.between(0, 100, symbols=["EURUSD"]) == []
+    assert table.count_between(0, 100) == 0
+    assert table.get(1) is None
+
+
+def test_append_grows_past_capacity():
+    table = make_table([make_deal(i, 10 * i) for i in range(1, 10)], capacity=2)
+
+    assert len(table) == 9
+    assert table.columns["profit"].tolist() == [float(i) for i in range(1, 10)]
+    assert table.get(5).time == 50
+    assert tickets(table) == list(range(1, 10))
+
+
+def test_between_in_order_bounds_are_inclusive():
+    table = make_table([make_deal(1, 10), make_deal(2, 20), make_deal(3, 20), make_deal(4, 30)])
+
+    assert tickets(table.between(20, 20)) == [2, 3]
+    assert tickets(table.between(10, 30)) == [1, 2, 3, 4]
+    assert tickets(table.between(11, 29)) == [2, 3]
+    assert table.between(31, 100) == []
+    assert table.between(0, 9) == []
+
+    assert table.count_between(20, 20) == 2
+    assert table.count_between(10, 30) == 4
+    assert table.count_between(31, 100) == 0
+
+
+def test_between_filters_symbols():
+    table = make_table([make_deal(1, 10, "EURUSD"), make_deal(2, 20, "USDJPY"), make_deal(3, 30, "EURUSD"),
+                        make_deal(4, 40, "GBPUSD")])
+
+    assert tickets(table.between(0, 100, symbols=["EURUSD"])) == [1, 3]
+    assert tickets(table.between(15, 100, symbols=["EURUSD"])) == [3]
+    assert tickets(table.between(0, 100, symbols=["GBPUSD", "USDJPY"])) == [2, 4] # insertion order, not the symbols' order
+    assert table.between(0, 100, symbols=["AUDUSD"]) == []
+
+
+def test_out_of_order_inserts():
+    table = make_table([make_deal(1, 30), make_deal(2, 10), make_deal(3, 20), make_deal(4, 10), make_deal(5, 40)])
+
+    assert tickets(table.between(10, 20)) == [2, 3, 4] # in insertion order
+    assert tickets(table.between(10, 10)) == [2, 4]
+    assert tickets(table.between(25, 100)) == [1, 5]
+    assert table.between(41, 100) == []
+
+    assert table.count_between(10, 20) == 3
+    assert table.count_between(0, 100) == 5
+    assert table.count_between(41, 100) == 0
+
+
+def test_rank_is_kept_up_to_date_after_out_of_order_inserts():
+    table = make_table([make_deal(1, 50), make_deal(2, 10)], capacity=2) # the rank is built here
+
+    for ticket, time in ((3, 30), (4, 60), (5, 10), (6, 20), (7, 50)): # inserted into the rank, growing it too
+        table.append(make_deal(ticket, time))
+
+    assert tickets(table.between(0, 100)) == [1, 2, 3, 4, 5, 6, 7]
+    assert tickets(table.between(10, 10)) == [2, 5]
+    assert tickets(table.between(20, 50)) == [1, 3, 6, 7]
+    assert tickets(table.between(60, 60)) == [4]
+    assert table.count_between(10, 30) == 4
+    assert table.count_between(50, 50) == 2
+
+
+def test_out_of_order_symbol_filter():
+    table = make_table([make_deal(1, 30, "EURUSD"), make_deal(2, 10, "USDJPY"), make_deal(3, 20, "EURUSD"),
+                        make_deal(4, 40, "USDJPY")])
+
+    assert tickets(table.between(0, 100, symbols=["EURUSD"])) == [1, 3]
+    assert tickets(table.between(15, 35, symbols=["EURUSD", "USDJPY"])) == [1, 3]
+    assert table.between(0, 100, symbols=["GBPUSD"]) == []
+
+
+def test_by_position():
+    table = make_table([make_deal(1, 10, position_id=7), make_deal(2, 20, position_id=8), make_deal(3, 30, position_id=7)])
+
+    assert tickets(table.by_position[7]) == [1, 3]
+    assert tickets(table.by_position[8]) == [2]
@@ -0,0 +1,103 @@
+import numpy as np
+import pytest
+
+from MetaTrader5 import ORDER_TYPE_BUY_LIMIT, ORDER_TYPE_SELL_STOP
+from strategytester5._kernels import (
+    window_until, window_range,
+    monitor_positions, EXIT_NONE, EXIT_TP, EXIT_SL, PROFIT_BY_CONTRACT,
+    monitor_orders, PENDING_WAIT, PENDING_EXPIRED, PENDING_FILL_BUY, PENDING_FILL_SELL,
+)
+
+TIMES = np.array([10, 20, 20, 30, 40], dtype=np.int64)
+EMPTY = np.empty(0, dtype=np.int64)
+
+
+def window(kernel, *args) -> tuple:
+    start, end = kernel(*args)
+    return int(start), int(end)
+
+
+def test_windows_of_an_empty_array():
+    assert window(window_until, EMPTY, 10, 5) == (0, 0)
+    assert window(window_range, EMPTY, 0, 10) == (0, 0)
+
+
+@pytest.mark.parametrize("t, count, expected", [
+    (20, 2, (1, 3)), # exactly on a bound, ties included
+    (20, 10, (0, 3)), # fewer items than requested
+    (25, 1, (2, 3)),
+    (40, 2, (3, 5)),
+    (100, 2, (3, 5)), # past the end
+    (5, 2, (0, 0)), # before the beginning
+    (30, 0, (4, 4)),
+])
+def test_window_until(t, count, expected):
+    assert window(window_until, TIMES, t, count) == expected
+
+
+@pytest.mark.parametrize("t_from, t_to, expected", [
+    (20, 20, (1, 3)), # both bounds inclusive
+    (10, 40, (0, 5)),
+    (11, 39, (1, 4)),
+    (0, 9, (0, 0)), # before the beginning
+    (41, 100, (5, 5)), # past the end
+    (30, 20, (3, 3)), # reversed range
+])
+def test_window_range(t_from, t_to, expected):
+    assert window(window_range, TIMES, t_from, t_to) == expected
+
+
+def test_monitor_positions():
+    n = 3
+    is_buy = np.array([True, False, True])
+    volumes = np.full(n, 0.1)
+    opens = np.array([1.1000, 1.1000, 1.1000])
+    currents = opens.copy()
+    profits = np.array([1.0, 2.0, 3.0])
+    sl = np.array([0.0, 1.1050, 1.0990])
+    tp = np.array([1.1010, 0.0, 0.0])
+    bids = np.array([1.1020, 1.1040, 1.0980])
+    asks = bids + 0.0010
+    kinds = np.full(n, PROFIT_BY_CONTRACT, dtype=np.int64)
+    factors = np.full(n, 100000.0)
+    zeros = np.zeros(n)
+    margin_a = np.full(n, 1000.0)
+
+    prices_out = np.empty(n)
+    profits_out = np.empty(n)
+    exits_out = np.empty(n, dtype=np.int8)
+
+    total_profit, total_margin = monitor_positions(is_buy, volumes, opens, currents, profits, sl, tp, bids, asks, kinds, factors,
+                                                   zeros, zeros, margin_a, zeros, prices_out, profits_out, exits_out)
+
+    assert total_profit == pytest.approx(6.0) # as of the previous pass
+    assert total_margin == pytest.approx(3 * 1000.0 * 0.1 * 1.1)
+
+    assert prices_out.tolist() == pytest.approx([1.1020, 1.1050, 1.0980]) # buys close at the bid, sells at the ask
+    assert profits_out.tolist() == pytest.approx([20.0, -50.0, -20.0])
+    assert exits_out.tolist() == [EXIT_TP, EXIT_SL, EXIT_SL]
+
+    bids[:] = 1.1005
+    monitor_positions(is_buy, volumes, opens, currents, profits, sl, tp, bids, bids + 0.0010, kinds, factors, zeros, zeros,
+                      margin_a, zeros, prices_out, profits_out, exits_out)
+    assert exits_out.tolist() == [EXIT_NONE, EXIT_NONE, EXIT_NONE]
+
+
+def test_monitor_orders():
+    types = np.array([ORDER_TYPE_BUY_LIMIT, ORDER_TYPE_BUY_LIMIT, ORDER_TYPE_SELL_STOP, ORDER_TYPE_SELL_STOP], dtype=np.int32)
+    opens = np.array([1.1000, 1.0900, 1.1000, 1.0900])
+    expirations = np.array([0, 0, 0, 50], dtype=np.int64)
+    symbol_ids = np.zeros(4, dtype=np.int32)
+    sym_bid = np.array([1.0990])
+    sym_ask = np.array([1.1000])
+    sym_time = np.array([100], dtype=np.int64)
+
+    actions = np.empty(4, dtype=np.int8)
+    prices = np.empty(4)
+
+    expired = monitor_orders(types, opens, expirations, symbol_ids, sym_bid, sym_ask, sym_time, actions, prices)
+
+    assert expired == 1
+    assert actions.tolist() == [PENDING_FILL_BUY, PENDING_WAIT, PENDING_FILL_SELL, PENDING_EXPIRED]
+    assert prices[0] == 1.1000 # a limit fills at its own price
+    assert prices[2] == 1.0990 # a stop fills at the market
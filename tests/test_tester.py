@@ -0,0 +1,321 @@
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+import pytest
+
+import MetaTrader5 as mt5
+from strategytester5 import tester as tester_module
+from strategytester5.tester import StrategyTester
+
+SYMBOL = "EURUSD"
+POINT = 1e-5
+SPREAD = 20 * POINT
+T0 = datetime(2025, 1, 2, 5, 0, tzinfo=timezone.utc)
+
+FLAG_MASKS = { # COPY_TICKS flags -> the TICK_FLAG bits of the ticks they return
+    mt5.COPY_TICKS_ALL: 2 | 4 | 8 | 16 | 32 | 64,
+    mt5.COPY_TICKS_INFO: 2 | 4,
+    mt5.COPY_TICKS_TRADE: 8 | 16,
+    mt5.COPY_TICKS_INFO | mt5.COPY_TICKS_TRADE: 2 | 4 | 8 | 16,
+}
+
+
+@pytest.fixture
+def make_tester(tmp_path, monkeypatch):
+
+    """Builds testers inside tmp_path, the history is fetched into the working directory"""
+
+    monkeypatch.chdir(tmp_path)
+
+    def make(modelling: str = "new_bar", start: str = "01.01.2025 00:00", end: str = "02.01.2025 00:00") -> StrategyTester:
+        config = {"bot_name": "TEST", "symbols": [SYMBOL], "timeframe": "H1", "start_date": start, "end_date": end,
+                  "modelling": modelling, "deposit": 1000, "leverage": "1:100"}
+
+        return StrategyTester(tester_config=config, mt5_instance=mt5, logs_dir=str(tmp_path / "Logs"),
+                              reports_dir=str(tmp_path / "Reports"), history_dir=str(tmp_path))
+
+    return make
+
+
+@pytest.fixture(params=[True, False], ids=["jit", "numpy"])
+def tester(request, make_tester, monkeypatch):
+
+    """A tester on the monitoring path of the kernels and on the one of numpy array operations"""
+
+    monkeypatch.setattr(tester_module, "JIT_ENABLED", request.param)
+    return make_tester()
+
+
+def set_price(tester: StrategyTester, bid: float, seconds: int = 0):
+    tester.TickUpdate(SYMBOL, {"time": T0 + timedelta(seconds=seconds), "bid": bid, "ask": round(bid + SPREAD, 5)})
+
+
+def monitor(tester: StrategyTester):
+
+    """One pass of the OnTick loop: the open positions then the pending orders"""
+
+    tester._StrategyTester__positions_monitoring()
+    tester._StrategyTester__pending_orders_monitoring()
+
+
+def market(tester: StrategyTester, order_type: int, sl: float = 0.0, tp: float = 0.0, volume: float = 0.1) -> dict:
+    tick = tester.symbol_info_tick(SYMBOL)
+    price = tick.ask if order_type == mt5.ORDER_TYPE_BUY else tick.bid
+
+    return tester.order_send({"action": mt5.TRADE_ACTION_DEAL, "type": order_type, "symbol": SYMBOL, "volume": volume,
+                              "price": price, "sl": sl, "tp": tp})
+
+
+def pending(tester: StrategyTester, order_type: int, price: float, **request) -> dict:
+    return tester.order_send({"action": mt5.TRADE_ACTION_PENDING, "type": order_type, "symbol": SYMBOL, "volume": 0.1,
+                              "price": price, **request})
+
+
+def deals_out(tester: StrategyTester) -> list:
+    deals = tester.history_deals_get(datetime(2024, 1, 1), datetime(2026, 1, 1))
+    return [deal for deal in deals if deal.entry == mt5.DEAL_ENTRY_OUT]
+
+
+def test_market_open_and_close(tester):
+    set_price(tester, 1.1)
+
+    result = market(tester, mt5.ORDER_TYPE_BUY)
+    assert result["retcode"] == mt5.TRADE_RETCODE_DONE
+
+    position, = tester.positions_get()
+    assert (position.ticket, position.type, position.volume, position.price_open) == (result["position"], mt5.POSITION_TYPE_BUY, 0.1, 1.1002)
+    assert tester.account_info().margin == 0
+
+    set_price(tester, 1.105, seconds=10)
+    monitor(tester)
+
+    assert tester.account_info().margin == pytest.approx(110.02) # valued at the prices of the previous pass
+    assert tester.positions_get()[0].profit == pytest.approx(48.0)
+
+    close = tester.order_send({"action": mt5.TRADE_ACTION_DEAL, "type": mt5.ORDER_TYPE_SELL, "symbol": SYMBOL, "volume": 0.1,
+                               "price": 1.105, "position": position.ticket})
+
+    assert close["retcode"] == mt5.TRADE_RETCODE_DONE
+    assert tester.positions_total() == 0
+    assert tester.account_info().balance == pytest.approx(1048.0)
+
+    deal, = deals_out(tester)
+    assert (deal.position_id, deal.type, deal.price, deal.profit) == (position.ticket, mt5.ORDER_TYPE_SELL, 1.105, pytest.approx(48.0))
+
+
+def test_closing_with_the_same_type_is_rejected(tester):
+    set_price(tester, 1.1)
+    position = market(tester, mt5.ORDER_TYPE_BUY)["position"]
+
+    assert tester.order_send({"action": mt5.TRADE_ACTION_DEAL, "type": mt5.ORDER_TYPE_BUY, "symbol": SYMBOL, "volume": 0.1,
+                              "price": 1.1002, "position": position}) is None
+    assert tester.positions_total() == 1
+
+
+@pytest.mark.parametrize("order_type, sl, tp, exit_bid, comment, profit", [
+    (mt5.ORDER_TYPE_BUY, 1.095, 1.105, 1.1051, "TP hit", 49.0),
+    (mt5.ORDER_TYPE_BUY, 1.095, 1.105, 1.0949, "SL hit", -53.0),
+    (mt5.ORDER_TYPE_SELL, 1.105, 1.095, 1.0948, "TP hit", 50.0), # closed at the ask
+    (mt5.ORDER_TYPE_SELL, 1.105, 1.095, 1.1049, "SL hit", -51.0),
+])
+def test_sl_and_tp_exits(tester, order_type, sl, tp, exit_bid, comment, profit):
+    set_price(tester, 1.1)
+    position = market(tester, order_type, sl=sl, tp=tp)["position"]
+
+    set_price(tester, 1.1, seconds=10) # within the stops
+    monitor(tester)
+    assert tester.positions_total() == 1
+
+    set_price(tester, exit_bid, seconds=20)
+    monitor(tester)
+    assert tester.positions_total() == 0
+
+    deal, = deals_out(tester)
+    assert (deal.position_id, deal.comment, deal.profit) == (position, comment, pytest.approx(profit))
+    assert tester.account_info().balance == pytest.approx(1000.0 + profit)
+
+
+def test_sltp_modification_moves_the_exit(tester):
+    set_price(tester, 1.1)
+    position = market(tester, mt5.ORDER_TYPE_BUY, sl=1.095, tp=1.105)["position"]
+
+    result = tester.order_send({"action": mt5.TRADE_ACTION_SLTP, "symbol": SYMBOL, "position": position, "sl": 1.09, "tp": 1.11})
+    assert result["retcode"] == mt5.TRADE_RETCODE_DONE
+    assert (tester.positions_get()[0].sl, tester.positions_get()[0].tp) == (1.09, 1.11)
+
+    set_price(tester, 1.106, seconds=10) # past the former take profit
+    monitor(tester)
+    assert tester.positions_total() == 1
+
+    set_price(tester, 1.0899, seconds=20)
+    monitor(tester)
+    assert deals_out(tester)[0].comment == "SL hit"
+
+
+@pytest.mark.parametrize("order_type, price, waiting_bid, trigger_bid, position_type, fill_price", [
+    (mt5.ORDER_TYPE_BUY_LIMIT, 1.098, 1.0979, 1.0977, mt5.POSITION_TYPE_BUY, 1.098), # limits fill at their price
+    (mt5.ORDER_TYPE_BUY_STOP, 1.102, 1.1015, 1.1019, mt5.POSITION_TYPE_BUY, 1.1021), # stops fill at the market
+    (mt5.ORDER_TYPE_SELL_LIMIT, 1.102, 1.1019, 1.1025, mt5.POSITION_TYPE_SELL, 1.102),
+    (mt5.ORDER_TYPE_SELL_STOP, 1.098, 1.0981, 1.0975, mt5.POSITION_TYPE_SELL, 1.0975),
+])
+def test_pending_order_fill(tester, order_type, price, waiting_bid, trigger_bid, position_type, fill_price):
+    set_price(tester, 1.1)
+    ticket = pending(tester, order_type, price, sl=0.0, tp=0.0)["order"]
+
+    order, = tester.orders_get()
+    assert (order.ticket, order.type, order.price_open, order.state) == (ticket, order_type, price, mt5.ORDER_STATE_PLACED)
+
+    set_price(tester, waiting_bid, seconds=10)
+    monitor(tester)
+    assert (tester.orders_total(), tester.positions_total()) == (1, 0)
+
+    set_price(tester, trigger_bid, seconds=20)
+    monitor(tester)
+    assert (tester.orders_total(), tester.positions_total()) == (0, 1)
+
+    position, = tester.positions_get()
+    assert (position.type, position.price_open) == (position_type, pytest.approx(fill_price))
+
+
+def test_pending_order_expiration(tester):
+    set_price(tester, 1.1)
+    pending(tester, mt5.ORDER_TYPE_BUY_LIMIT, 1.098, expiration=T0 + timedelta(seconds=60))
+    pending(tester, mt5.ORDER_TYPE_SELL_LIMIT, 1.102)
+
+    set_price(tester, 1.1, seconds=59)
+    monitor(tester)
+    assert tester.orders_total() == 2
+
+    set_price(tester, 1.0977, seconds=60) # would have filled the expired order
+    monitor(tester)
+
+    order, = tester.orders_get()
+    assert order.type == mt5.ORDER_TYPE_SELL_LIMIT
+    assert tester.positions_total() == 0
+
+
+def test_pending_order_remove(tester):
+    set_price(tester, 1.1)
+    ticket = pending(tester, mt5.ORDER_TYPE_BUY_LIMIT, 1.098)["order"]
+    kept = pending(tester, mt5.ORDER_TYPE_BUY_LIMIT, 1.097)["order"]
+
+    result = tester.order_send({"action": mt5.TRADE_ACTION_REMOVE, "symbol": SYMBOL, "order": ticket})
+    assert result["retcode"] == mt5.TRADE_RETCODE_DONE
+    assert [order.ticket for order in tester.orders_get()] == [kept]
+
+    set_price(tester, 1.0977, seconds=10)
+    monitor(tester)
+    assert (tester.orders_total(), tester.positions_total()) == (1, 0)
+
+
+def test_pending_order_modify(tester):
+    set_price(tester, 1.1)
+    ticket = pending(tester, mt5.ORDER_TYPE_BUY_LIMIT, 1.098)["order"]
+
+    result = tester.order_send({"action": mt5.TRADE_ACTION_MODIFY, "type": mt5.ORDER_TYPE_BUY_LIMIT, "symbol": SYMBOL,
+                                "order": ticket, "price": 1.095, "sl": 1.09, "tp": 1.1})
+    assert result["retcode"] == mt5.TRADE_RETCODE_DONE
+
+    order, = tester.orders_get()
+    assert (order.price_open, order.sl, order.tp) == (1.095, 1.09, 1.1)
+
+    set_price(tester, 1.0977, seconds=10) # past the former price only
+    monitor(tester)
+    assert tester.positions_total() == 0
+
+    set_price(tester, 1.0947, seconds=20)
+    monitor(tester)
+
+    position, = tester.positions_get()
+    assert (position.price_open, position.sl, position.tp) == (1.095, 1.09, 1.1)
+
+
+def snapshot(tester: StrategyTester) -> tuple:
+
+    """The state a monitoring pass leaves behind, without the tickets which are drawn from the clock"""
+
+    account = tester.account_info()
+    positions = [(p.type, p.volume, p.price_open, p.price_current, p.profit, p.sl, p.tp) for p in tester.positions_get()]
+    orders = [(o.type, o.price_open) for o in tester.orders_get()]
+    deals = [(d.type, d.entry, d.price, d.profit, d.comment) for d in tester.history_deals_get(datetime(2024, 1, 1), datetime(2026, 1, 1))]
+
+    return (account.balance, account.equity, account.profit, account.margin, account.margin_free), positions, orders, deals
+
+
+def test_jit_and_numpy_monitoring_agree(make_tester, monkeypatch):
+    bids = 1.1 + 0.004 * np.sin(np.arange(60) / 5)
+
+    def run(jit: bool) -> list:
+        monkeypatch.setattr(tester_module, "JIT_ENABLED", jit)
+        tester = make_tester()
+        set_price(tester, 1.1)
+
+        for i, offset in enumerate((20, 30, 40)):
+            market(tester, mt5.ORDER_TYPE_BUY, sl=round(1.1 - offset * 1e-4, 5), tp=round(1.1 + offset * 1e-4, 5), volume=0.01 * (i + 1))
+            market(tester, mt5.ORDER_TYPE_SELL, sl=round(1.1 + offset * 1e-4, 5), tp=round(1.1 - offset * 1e-4, 5))
+            pending(tester, mt5.ORDER_TYPE_BUY_LIMIT, round(1.1 - offset * 1e-4, 5))
+            pending(tester, mt5.ORDER_TYPE_SELL_STOP, round(1.1 - offset * 1e-4, 5), expiration=T0 + timedelta(seconds=100 * offset))
+
+        snapshots = []
+        for i, bid in enumerate(bids.round(5).tolist()):
+            set_price(tester, bid, seconds=10 * (i + 1))
+            monitor(tester)
+            snapshots.append(snapshot(tester))
+
+        return snapshots
+
+    jit, numpy = run(True), run(False)
+
+    assert len(jit[-1][3]) > 7 # positions were opened and closed along the way
+    for a, b in zip(jit, numpy):
+        assert a[0] == pytest.approx(b[0])
+        assert a[1:] == b[1:]
+
+
+@pytest.fixture
+def tick_tester(make_tester) -> tuple:
+
+    """A real ticks tester and the ticks its history was fetched from"""
+
+    tester = make_tester("real_ticks", start="01.01.2025 00:00", end="01.01.2025 01:00")
+    source = mt5.copy_ticks_range(SYMBOL, datetime(2025, 1, 1, tzinfo=timezone.utc), datetime(2025, 1, 1, 1, tzinfo=timezone.utc), mt5.COPY_TICKS_ALL)
+
+    return tester, source
+
+
+@pytest.mark.parametrize("flags", list(FLAG_MASKS), ids=["all", "info", "trade", "info_trade"])
+def test_copy_ticks_range(tick_tester, flags):
+    tester, source = tick_tester
+    date_from = datetime(2025, 1, 1, 0, 1, 35, tzinfo=timezone.utc) # between two ticks
+    date_to = datetime(2025, 1, 1, 0, 30, tzinfo=timezone.utc) # on a tick, included
+
+    result = tester.copy_ticks_range(SYMBOL, date_from, date_to, flags)
+
+    times = source["time"]
+    expected = source[(times >= date_from.timestamp()) & (times <= date_to.timestamp()) & (source["flags"] & FLAG_MASKS[flags] != 0)]
+
+    assert result["time_msc"].tolist() == expected["time_msc"].tolist()
+    assert result["flags"].tolist() == expected["flags"].tolist()
+    assert result["bid"].tolist() == expected["bid"].tolist()
+    assert (result["flags"] != 0).all() # ticks without flags are never copied
+
+
+@pytest.mark.parametrize("flags", list(FLAG_MASKS), ids=["all", "info", "trade", "info_trade"])
+def test_copy_ticks_from(tick_tester, flags):
+    tester, source = tick_tester
+    date_from = datetime(2025, 1, 1, 0, 1, 35, tzinfo=timezone.utc)
+
+    result = tester.copy_ticks_from(SYMBOL, date_from, 7, flags)
+
+    expected = source[(source["time"] >= date_from.timestamp()) & (source["flags"] & FLAG_MASKS[flags] != 0)][:7]
+
+    assert result["time_msc"].tolist() == expected["time_msc"].tolist()
+    assert result["flags"].tolist() == expected["flags"].tolist()
+
+
+def test_copy_ticks_from_past_the_end(tick_tester):
+    tester, source = tick_tester
+
+    assert len(tester.copy_ticks_from(SYMBOL, datetime(2025, 1, 1, 0, 59, 45, tzinfo=timezone.utc), 100, mt5.COPY_TICKS_ALL)) == 1
+    assert len(tester.copy_ticks_from(SYMBOL, datetime(2025, 1, 2, tzinfo=timezone.utc), 100, mt5.COPY_TICKS_ALL)) == 0
+    assert len(tester.copy_ticks_range(SYMBOL, datetime(2025, 1, 2, tzinfo=timezone.utc), datetime(2025, 1, 3, tzinfo=timezone.utc), mt5.COPY_TICKS_ALL)) == 0